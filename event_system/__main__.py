@@ -2,14 +2,24 @@
 # Main entry point for the Event Registration and Attendance System.
 
 import argparse
-from .ui import EventSystemUI
-from .web_ui import app as web_app
-from . import db
+import logging
+from logging.handlers import RotatingFileHandler
+
+def configure_logging():
+    """
+    Sends application log records to a size-capped, rotating log file.
+    """
+    handler = RotatingFileHandler("event_system.log", maxBytes=1_000_000, backupCount=3)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    root_logger.setLevel(logging.INFO)
 
 def main():
     """
     Initializes and runs the selected application interface.
     """
+    configure_logging()
     parser = argparse.ArgumentParser(description="Event Registration and Attendance System")
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--ui", action="store_true", help="Run the Tkinter desktop UI")
@@ -17,11 +27,15 @@ def main():
 
     args = parser.parse_args()
 
+    # Each interface is imported only when chosen: importing web_ui loads Flask
+    # and opens its own connection pool, which the desktop UI doesn't need.
     if args.web:
+        from .web_ui import app as web_app
         print("Starting the Event Management System Web UI...")
         # Note: For production, use a proper WSGI server instead of app.run()
         web_app.run(host='0.0.0.0', debug=True)
     else:
+        from .ui import EventSystemUI
         print("Starting the Event Management System Desktop UI...")
         app = EventSystemUI()
         app.mainloop()
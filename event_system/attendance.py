@@ -2,7 +2,87 @@
 # Handles marking and viewing of student attendance for events.
 
 from . import db
-import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+
+log = logging.getLogger(__name__)
+
+# --- SQL Statements ---
+# Kept at module level so every call passes the identical string object and the
+# driver's statement cache (see db.init_pool) can reuse the parsed statement.
+
+# The USING clause only yields a row when the event has started and the student
+# is registered for it, so validation and the write happen in a single server call.
+_SQL_MARK_MERGE = """
+MERGE INTO ATTENDANCE a
+USING (
+    SELECT r.event_id, r.student_id
+    FROM EVENTS e
+    JOIN REGISTRATIONS r ON r.event_id = e.event_id AND r.student_id = :student_id
+    WHERE e.event_id = :event_id
+      AND TRUNC(e.event_date) <= TRUNC(SYSDATE)
+) s
+ON (a.event_id = s.event_id AND a.student_id = s.student_id)
+WHEN MATCHED THEN
+    UPDATE SET a.attended = :status
+WHEN NOT MATCHED THEN
+    INSERT (event_id, student_id, attended)
+    VALUES (s.event_id, s.student_id, :status)
+"""
+
+_SQL_MARK_DIAGNOSTIC = """
+SELECT
+    TO_CHAR(e.event_date, 'YYYY-MM-DD') AS event_date,
+    CASE WHEN TRUNC(e.event_date) > TRUNC(SYSDATE) THEN 1 ELSE 0 END AS is_future,
+    (SELECT 1 FROM REGISTRATIONS r
+     WHERE r.event_id = e.event_id AND r.student_id = :student_id) AS is_registered
+FROM EVENTS e
+WHERE e.event_id = :event_id
+"""
+
+_SQL_EVENT_DATE_CHECK = """
+SELECT TO_CHAR(event_date, 'YYYY-MM-DD'),
+       CASE WHEN TRUNC(event_date) > TRUNC(SYSDATE) THEN 1 ELSE 0 END
+FROM EVENTS WHERE event_id = :event_id
+"""
+
+_SQL_REGISTERED_STUDENT_IDS = "SELECT student_id FROM REGISTRATIONS WHERE event_id = :event_id"
+
+_SQL_BULK_MARK_MERGE = """
+MERGE INTO ATTENDANCE a
+USING (SELECT :event_id AS event_id, :student_id AS student_id FROM dual) s
+ON (a.event_id = s.event_id AND a.student_id = s.student_id)
+WHEN MATCHED THEN
+    UPDATE SET a.attended = :status
+WHEN NOT MATCHED THEN
+    INSERT (event_id, student_id, attended)
+    VALUES (:event_id, :student_id, :status)
+"""
+
+# Locks one hash slice of an event's registrations. Rows already locked by
+# another marking station are skipped rather than waited on.
+_SQL_LOCK_REGISTRATION_SLICE = """
+SELECT student_id FROM REGISTRATIONS
+WHERE event_id = :event_id
+  AND MOD(ORA_HASH(student_id), :workers) = :worker
+FOR UPDATE SKIP LOCKED
+"""
+
+# Number of pooled connections used by mark_attendance_parallel; kept below the
+# pool maximum so other screens can still get a connection meanwhile.
+_PARALLEL_MARK_WORKERS = 3
+
+_SQL_GET_EVENT_ATTENDANCE = """
+SELECT
+    s.student_id,
+    s.name,
+    NVL(a.attended, 'N') AS attendance_status
+FROM REGISTRATIONS r
+JOIN STUDENTS s ON r.student_id = s.student_id
+LEFT JOIN ATTENDANCE a ON r.event_id = a.event_id AND r.student_id = a.student_id
+WHERE r.event_id = :event_id
+ORDER BY s.name
+"""
 
 def mark_attendance(event_id, student_id, attended_status='Y'):
     """
@@ -12,73 +92,163 @@ def mark_attendance(event_id, student_id, attended_status='Y'):
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                # --- Check 1: Event Date vs. Current Date ---
-                cursor.execute("SELECT event_date FROM EVENTS WHERE event_id = :event_id", {'event_id': event_id})
-                result = cursor.fetchone()
-                if not result:
-                    return "Error: Event not found."
-                
-                event_date = result[0]
-                current_date = datetime.date.today()
-                if isinstance(event_date, datetime.datetime):
-                    event_date = event_date.date()
-                if event_date > current_date:
-                    return f"Error: Attendance can only be marked on or after the event date ({event_date.strftime('%Y-%m-%d')})."
-
-                # --- Check 2: Student Registration ---
-                cursor.execute(
-                    "SELECT reg_id FROM REGISTRATIONS WHERE event_id = :event_id AND student_id = :student_id",
-                    {'event_id': event_id, 'student_id': student_id}
-                )
-                if not cursor.fetchone():
-                    return "Error: Cannot mark attendance for a student who is not registered for this event."
-
-                # --- Upsert Operation using MERGE ---
-                merge_query = """
-                MERGE INTO ATTENDANCE a
-                USING (SELECT :event_id AS event_id, :student_id AS student_id FROM dual) s
-                ON (a.event_id = s.event_id AND a.student_id = s.student_id)
-                WHEN MATCHED THEN
-                    UPDATE SET a.attended = :status
-                WHEN NOT MATCHED THEN
-                    INSERT (event_id, student_id, attended)
-                    VALUES (:event_id, :student_id, :status)
-                """
-                cursor.execute(merge_query, {
+                # --- Upsert Operation using MERGE (validation included) ---
+                cursor.execute(_SQL_MARK_MERGE, {
                     'event_id': event_id,
                     'student_id': student_id,
                     'status': attended_status
                 })
-                
+
+                if cursor.rowcount == 0:
+                    # --- Nothing merged: find out which rule rejected it ---
+                    cursor.execute(_SQL_MARK_DIAGNOSTIC, {'event_id': event_id, 'student_id': student_id})
+                    result = cursor.fetchone()
+                    if not result:
+                        return "Error: Event not found."
+                    event_date, is_future, is_registered = result
+                    if is_future:
+                        return f"Error: Attendance can only be marked on or after the event date ({event_date})."
+                    if not is_registered:
+                        return "Error: Cannot mark attendance for a student who is not registered for this event."
+                    return "Error: Attendance record could not be saved."
+
                 conn.commit()
                 return "Success: Attendance record saved successfully."
 
     except Exception as e:
-        print(f"Error marking attendance: {e}")
+        log.exception("Error marking attendance")
         return f"An unexpected error occurred: {e}"
 
-def get_event_attendance(event_id):
+def mark_attendance_bulk(event_id, records):
     """
-    Retrieves the attendance status for all registered students for an event.
+    Marks attendance for many students of one event in a single batch.
+    `records` is a list of (student_id, attended_status) pairs. The event and
+    its registrations are validated once, then all rows are merged with one
+    executemany call and a single commit.
+    """
+    try:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # --- Check 1: Event Date vs. Current Date ---
+                cursor.execute(_SQL_EVENT_DATE_CHECK, {'event_id': event_id})
+                result = cursor.fetchone()
+                if not result:
+                    return "Error: Event not found."
+                event_date, is_future = result
+                if is_future:
+                    return f"Error: Attendance can only be marked on or after the event date ({event_date})."
+
+                # --- Check 2: Student Registration (loaded once for the whole batch) ---
+                cursor.arraysize = 500
+                cursor.prefetchrows = 501
+                cursor.execute(_SQL_REGISTERED_STUDENT_IDS, {'event_id': event_id})
+                registered_ids = {row[0] for row in cursor}
+
+                valid_rows = [
+                    {'event_id': event_id, 'student_id': student_id, 'status': status}
+                    for student_id, status in records
+                    if student_id in registered_ids
+                ]
+                skipped = len(records) - len(valid_rows)
+                if not valid_rows:
+                    return "Error: None of the given students are registered for this event."
+
+                # --- Batched Upsert Operation using MERGE ---
+                cursor.executemany(_SQL_BULK_MARK_MERGE, valid_rows)
+
+                conn.commit()
+                message = f"Success: Attendance saved for {len(valid_rows)} student(s)."
+                if skipped:
+                    message += f" Skipped {skipped} student(s) not registered for this event."
+                return message
+
+    except Exception as e:
+        log.exception("Error marking attendance in bulk")
+        return f"An unexpected error occurred: {e}"
+
+def _mark_attendance_slice(event_id, statuses, workers, worker):
+    """
+    Locks this worker's slice of the event's registrations and merges the
+    requested statuses for the students in it. Returns the number of rows saved.
+    """
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.arraysize = 500
+            cursor.execute(_SQL_LOCK_REGISTRATION_SLICE, {'event_id': event_id, 'workers': workers, 'worker': worker})
+            slice_rows = [
+                {'event_id': event_id, 'student_id': student_id, 'status': statuses[student_id]}
+                for student_id, in cursor
+                if student_id in statuses
+            ]
+            if slice_rows:
+                cursor.executemany(_SQL_BULK_MARK_MERGE, slice_rows)
+            conn.commit()
+            return len(slice_rows)
+
+def mark_attendance_parallel(event_id, records, workers=_PARALLEL_MARK_WORKERS):
+    """
+    Marks attendance for many students of one event using several pooled
+    connections at once, for events with multiple volunteer stations.
+    `records` is a list of (student_id, attended_status) pairs. Registrations
+    are split into `workers` slices by ORA_HASH(student_id); each worker locks
+    its slice with FOR UPDATE SKIP LOCKED and merges it, so workers never wait
+    on each other or on another station. Students that are not registered, or
+    whose row is currently locked elsewhere, are reported as skipped. Each
+    slice commits on its own, so if some slices fail the message says how many
+    students were saved by the others.
     """
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = """
-                SELECT
-                    s.student_id,
-                    s.name,
-                    NVL(a.attended, 'N') AS attendance_status
-                FROM REGISTRATIONS r
-                JOIN STUDENTS s ON r.student_id = s.student_id
-                LEFT JOIN ATTENDANCE a ON r.event_id = a.event_id AND r.student_id = a.student_id
-                WHERE r.event_id = :event_id
-                ORDER BY s.name
-                """
-                cursor.execute(query, {'event_id': event_id})
-                return cursor.fetchall()
+                cursor.execute(_SQL_EVENT_DATE_CHECK, {'event_id': event_id})
+                result = cursor.fetchone()
+        if not result:
+            return "Error: Event not found."
+        event_date, is_future = result
+        if is_future:
+            return f"Error: Attendance can only be marked on or after the event date ({event_date})."
+
+        statuses = dict(records)
+        saved = 0
+        failed_slices = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_mark_attendance_slice, event_id, statuses, workers, worker)
+                for worker in range(workers)
+            ]
+            for future in as_completed(futures):
+                try:
+                    saved += future.result()
+                except Exception:
+                    failed_slices += 1
+                    log.exception("Error marking a slice of attendance for event %s", event_id)
+
+        if failed_slices:
+            return (f"Error: {failed_slices} of {workers} batch(es) failed; attendance was saved for "
+                    f"{saved} student(s) and the rest were not saved. Please mark them again.")
+        if not saved:
+            return "Error: None of the given students could be marked (not registered or in use by another station)."
+        message = f"Success: Attendance saved for {saved} student(s)."
+        skipped = len(statuses) - saved
+        if skipped:
+            message += f" Skipped {skipped} student(s) not registered or in use by another station."
+        return message
+
     except Exception as e:
-        print(f"Error fetching event attendance: {e}")
+        log.exception("Error marking attendance in parallel")
+        return f"An unexpected error occurred: {e}"
+
+def get_event_attendance(event_id):
+    """
+    Retrieves the attendance status for all registered students for an event.
+    """
+    try:
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_GET_EVENT_ATTENDANCE, {'event_id': event_id})
+            db.use_named_rows(cursor)
+            return cursor.fetchall()
+    except Exception:
+        log.exception("Error fetching event attendance")
         return []
 
 # Example usage (for testing purposes)
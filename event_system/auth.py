@@ -3,8 +3,11 @@
 
 import bcrypt
 from . import db
+import logging
 import oracledb
 
+log = logging.getLogger(__name__)
+
 def hash_password(plain_text_password):
     """Hashes a password using bcrypt."""
     salt = bcrypt.gensalt()
@@ -79,14 +82,14 @@ def login(username, password):
                             'username': db_username,
                             'role': role
                         }
-                        print(f"Login successful for user: {db_username}, Role: {role}")
+                        log.info("Login successful for user: %s, Role: %s", db_username, role)
                         return user_data
 
                 # If user not found or password doesn't match
-                print("Invalid username or password.")
+                log.info("Invalid username or password for user: %s", username)
                 return None
-    except Exception as e:
-        print(f"An error occurred during login: {e}")
+    except Exception:
+        log.exception("An error occurred during login")
         return None
 
 
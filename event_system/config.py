@@ -13,6 +13,11 @@ DB_CONFIG = {
     'dsn': os.environ.get('DB_DSN', 'localhost:1521/XEPDB1')
 }
 
+# --- Bulk Fetch Tuning ---
+# Rows fetched per network round-trip for large result sets (student lists,
+# CSV exports). Raise it for remote databases, lower it to save memory.
+DB_FETCH_ARRAYSIZE = int(os.environ.get('DB_FETCH_ARRAYSIZE', 1000))
+
 # --- Email Configuration ---
 # Retrieves SMTP server details from environment variables for sending emails.
 EMAIL_CONFIG = {
@@ -1,9 +1,14 @@
 # db.py
 # Handles the connection to the Oracle database using a connection pool.
 
+import collections
+import contextlib
+import logging
 import oracledb
 import threading
-from .config import DB_CONFIG
+from .config import DB_CONFIG, DB_FETCH_ARRAYSIZE
+
+log = logging.getLogger(__name__)
 
 # Global variable to hold the connection pool
 pool = None
@@ -20,13 +25,16 @@ def init_pool():
             password=DB_CONFIG["password"],
             dsn=DB_CONFIG["dsn"],
             min=2,  # Minimum number of connections in the pool
-            max=5,  # Maximum number of connections in the pool
-            increment=1  # How many connections to create when more are needed
+            max=8,  # Enough for background UI fetches and parallel attendance marking
+            increment=1,  # How many connections to create when more are needed
+            getmode=oracledb.POOL_GETMODE_WAIT,  # Wait for a free connection instead of failing
+            stmtcachesize=50,  # Keep parsed statements for the app's queries on every connection
+            cclass="event_system"  # Connection class, lets DRCP reuse server sessions
         )
-        print("Connection pool created successfully.")
+        log.info("Connection pool created successfully.")
 
-    except oracledb.DatabaseError as e:
-        print(f"Error creating the connection pool: {e}")
+    except oracledb.DatabaseError:
+        log.exception("Error creating the connection pool")
         # The application should not proceed without a database connection
         raise
 
@@ -36,7 +44,7 @@ def get_connection():
     """
     global pool
     if not pool:
-        print("Pool is not initialized. Call init_pool() first.")
+        log.warning("Pool is not initialized. Call init_pool() first.")
         # Depending on the app's design, you might want to auto-initialize here,
         # but explicit initialization is safer.
         init_pool()
@@ -44,10 +52,21 @@ def get_connection():
     try:
         connection = pool.acquire()
         return connection
-    except oracledb.DatabaseError as e:
-        print(f"Error acquiring connection from pool: {e}")
+    except oracledb.DatabaseError:
+        log.exception("Error acquiring connection from pool")
         return None
 
+@contextlib.contextmanager
+def cursor():
+    """
+    Checks a connection out of the pool and yields a cursor on it; both are
+    released when the block ends. Shorthand for the read-only lookups that
+    need nothing from the connection itself.
+    """
+    with get_connection() as connection:
+        with connection.cursor() as cur:
+            yield cur
+
 def close_pool():
     """
     Closes the connection pool.
@@ -58,5 +77,23 @@ def close_pool():
         # The busy_timeout forces connections to be returned to the pool,
         # which is useful if some threads failed to release their connections.
         pool.close(force=True)
-        print("Connection pool closed.")
+        log.info("Connection pool closed.")
         pool = None
+
+def use_named_rows(cursor):
+    """
+    Makes the cursor return rows as namedtuples named after the selected
+    columns (lower-cased), e.g. row.student_id. Call after cursor.execute().
+    Rows still unpack and index like plain tuples.
+    """
+    row_type = collections.namedtuple('Row', [d[0].lower() for d in cursor.description])
+    cursor.rowfactory = row_type
+
+def tune_for_bulk_fetch(cursor):
+    """
+    Sizes the cursor's fetch batches for large result sets. Call before
+    cursor.execute(); prefetchrows is one more than arraysize so the first
+    batch arrives with the execute round-trip.
+    """
+    cursor.arraysize = DB_FETCH_ARRAYSIZE
+    cursor.prefetchrows = DB_FETCH_ARRAYSIZE + 1
@@ -10,13 +10,17 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 from .config import EMAIL_CONFIG
 
-def send_email(to_email, subject, body):
+def _build_message(to_email, subject, body):
     msg = MIMEMultipart()
     msg['From'] = EMAIL_CONFIG["sender_email"]
     msg['To'] = to_email
     msg['Subject'] = subject
 
     msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+def send_email(to_email, subject, body):
+    msg = _build_message(to_email, subject, body)
 
     try:
         # Create a default SSL context
@@ -40,6 +44,39 @@ def send_email(to_email, subject, body):
         logging.error(f"Failed to send email to {to_email} - General Error: {e}", exc_info=True)
         return False
 
+def send_emails(recipients, subject, body):
+    """
+    Sends the same email to each recipient over a single SMTP session, so the
+    connect, STARTTLS and login handshake happens once per batch rather than
+    once per recipient. Returns a dict with 'success_count' and 'fail_count'.
+    """
+    success_count = 0
+    try:
+        context = ssl.create_default_context()
+        with smtplib.SMTP(EMAIL_CONFIG["smtp_server"], EMAIL_CONFIG["smtp_port"]) as server:
+            server.starttls(context=context)  # Secure the connection
+            server.login(EMAIL_CONFIG["smtp_username"], EMAIL_CONFIG["smtp_password"])
+            for recipient in recipients:
+                try:
+                    server.send_message(_build_message(recipient, subject, body))
+                    success_count += 1
+                    logging.info(f"Email sent successfully to {recipient} for subject: {subject}")
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                    # Only this recipient was rejected; the session is still usable
+                    logging.error(f"Failed to send email to {recipient} - SMTP Error: {e}")
+    except smtplib.SMTPAuthenticationError as e:
+        logging.error(f"Failed to send emails - Authentication Error: {e}. Check SMTP username/password.")
+    except smtplib.SMTPServerDisconnected as e:
+        logging.error(f"Failed to send emails - Server Disconnected: {e}. Check SMTP server/port.")
+    except smtplib.SMTPException as e:
+        logging.error(f"Failed to send emails - SMTP Error: {e}")
+    except Exception as e:
+        logging.error(f"Failed to send emails - General Error: {e}", exc_info=True)
+
+    # Rejected recipients, and any not reached because the session failed
+    fail_count = len(recipients) - success_count
+    return {'success_count': success_count, 'fail_count': fail_count}
+
 def create_event_notification_email_body(event_name, event_date, event_time, event_location, custom_message=""):
     """
     Creates the body of an event notification email, sanitizing inputs to prevent header injection.
@@ -72,6 +109,7 @@ The Event Management Team
 def send_emails_in_background(recipients, subject, body, completion_callback=None):
     """
     Sends multiple emails in a separate thread to avoid blocking the main UI thread.
+    All recipients share one SMTP session (see send_emails).
 
     Args:
         recipients (list): A list of email addresses to send the email to.
@@ -81,17 +119,12 @@ def send_emails_in_background(recipients, subject, body, completion_callback=Non
                                                    have been attempted to send.
                                                    It will receive a dictionary with
                                                    'success_count' and 'fail_count'.
+                                                   It runs on the sending thread.
     """
     def _send_emails_task():
-        success_count = 0
-        fail_count = 0
-        for recipient in recipients:
-            if send_email(recipient, subject, body):
-                success_count += 1
-            else:
-                fail_count += 1
+        results = send_emails(recipients, subject, body)
         if completion_callback:
-            completion_callback({'success_count': success_count, 'fail_count': fail_count})
+            completion_callback(results)
 
     # Start the email sending in a new thread
     thread = threading.Thread(target=_send_emails_task)
@@ -3,95 +3,243 @@
 
 from . import db
 import datetime
+import logging
+import threading
+import time
 
-def create_event(current_user_role, event_name, event_date, event_time, venue, total_slots):
+log = logging.getLogger(__name__)
+
+# --- SQL Statements ---
+# Kept at module level so every call passes the identical string object and the
+# driver's statement cache (see db.init_pool) can reuse the parsed statement.
+
+_SQL_CREATE_EVENT = """
+INSERT INTO EVENTS (event_name, event_date, event_time, venue, total_slots)
+VALUES (:event_name, :event_date, :event_time, :venue, :total_slots)
+"""
+
+_SQL_GET_ALL_EVENTS = "SELECT event_id, event_name, event_date, event_time, venue, total_slots FROM EVENTS ORDER BY event_date DESC"
+
+_SQL_GET_EVENT_DETAILS = "SELECT event_id, event_name, event_date, event_time, venue, total_slots FROM EVENTS WHERE event_id = :event_id"
+
+# --- Events Cache ---
+# EVENTS changes rarely but is read on almost every screen/page render, so
+# results are kept in-process for a short time and dropped whenever an event
+# is created.
+_CACHE_TTL_SECONDS = 30
+_CACHE_LOCK = threading.Lock()
+_EVENTS_CACHE = {}  # event_id -> (timestamp, row)
+_ALL_EVENTS_CACHE = {'data': None, 'ts': 0, 'choices': None}
+# Bumped on every invalidation. A read records it before querying and only
+# stores its result if it is unchanged, so rows fetched before an event was
+# created can't be cached after the invalidation.
+_cache_generation = 0
+
+def _invalidate_events_cache():
+    """Drops all cached event data so the next read goes to the database."""
+    global _cache_generation
+    with _CACHE_LOCK:
+        _cache_generation += 1
+        _EVENTS_CACHE.clear()
+        _ALL_EVENTS_CACHE['data'] = None
+        _ALL_EVENTS_CACHE['ts'] = 0
+        _ALL_EVENTS_CACHE['choices'] = None
+
+def _validate_event_row(row):
     """
-    Creates a new event and saves it to the database.
-    This action is restricted to admin users.
+    Validates a single event's fields and returns a cleaned dict ready to be
+    bound to the INSERT. Raises ValueError with a user-facing message if any
+    field is missing or malformed.
     """
-    if current_user_role != 'admin':
-        return "Error: Administrative privileges required."
+    event_name = row.get('event_name')
+    event_date = row.get('event_date')
+    event_time = row.get('event_time')
+    venue = row.get('venue')
+    total_slots = row.get('total_slots')
 
     if not all([event_name, event_date, event_time, venue, total_slots]):
-        return "Error: All fields are required."
-    
+        raise ValueError("Error: All fields are required.")
+
     try:
         slots = int(total_slots)
-        if slots <= 0:
-            return "Error: Total slots must be a positive number."
     except (ValueError, TypeError):
-        return "Error: Total slots must be a valid number."
+        raise ValueError("Error: Total slots must be a valid number.")
+    if slots <= 0:
+        raise ValueError("Error: Total slots must be a positive number.")
 
-    try:
-        # Validate and format event_date
-        if isinstance(event_date, datetime.date):
-            formatted_date = event_date.strftime('%Y-%m-%d')
-        else:
-            try:
-                formatted_date = datetime.datetime.strptime(str(event_date), '%Y-%m-%d').strftime('%Y-%m-%d')
-            except ValueError:
-                return "Error: Invalid date format. Please use YYYY-MM-DD."
+    # Validate event_date; it is bound as a date so Oracle receives a DATE directly
+    if isinstance(event_date, datetime.datetime):
+        date_obj = event_date.date()
+    elif isinstance(event_date, datetime.date):
+        date_obj = event_date
+    else:
+        try:
+            date_obj = datetime.datetime.strptime(str(event_date), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("Error: Invalid date format. Please use YYYY-MM-DD.")
 
-        # Validate and format event_time
+    # Validate and format event_time
+    try:
+        # Try parsing with AM/PM
+        dt_time = datetime.datetime.strptime(str(event_time), '%I:%M %p')
+    except ValueError:
         try:
-            # Try parsing with AM/PM
-            dt_time = datetime.datetime.strptime(str(event_time), '%I:%M %p')
+            # Try parsing with 24-hour format
+            dt_time = datetime.datetime.strptime(str(event_time), '%H:%M')
         except ValueError:
-            try:
-                # Try parsing with 24-hour format
-                dt_time = datetime.datetime.strptime(str(event_time), '%H:%M')
-            except ValueError:
-                return "Error: Invalid time format. Please use HH:MM AM/PM or HH:MM."
-        
-        formatted_time = dt_time.strftime('%I:%M %p')
+            raise ValueError("Error: Invalid time format. Please use HH:MM AM/PM or HH:MM.")
+
+    return {
+        'event_name': event_name,
+        'event_date': date_obj,
+        'event_time': dt_time.strftime('%I:%M %p'),
+        'venue': venue,
+        'total_slots': slots
+    }
+
+def create_event(current_user_role, event_name, event_date, event_time, venue, total_slots):
+    """
+    Creates a new event and saves it to the database.
+    This action is restricted to admin users.
+    """
+    if current_user_role != 'admin':
+        return "Error: Administrative privileges required."
 
+    try:
+        event_row = _validate_event_row({
+            'event_name': event_name,
+            'event_date': event_date,
+            'event_time': event_time,
+            'venue': venue,
+            'total_slots': total_slots
+        })
+    except ValueError as e:
+        return str(e)
+
+    try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = """
-                INSERT INTO EVENTS (event_name, event_date, event_time, venue, total_slots)
-                VALUES (:event_name, TO_DATE(:event_date, 'YYYY-MM-DD'), :event_time, :venue, :total_slots)
-                """
-                cursor.execute(query, {
-                    'event_name': event_name,
-                    'event_date': formatted_date,
-                    'event_time': formatted_time,
-                    'venue': venue,
-                    'total_slots': slots
-                })
+                cursor.execute(_SQL_CREATE_EVENT, event_row)
                 conn.commit()
-                print(f"Successfully created event: {event_name}")
+                _invalidate_events_cache()
+                log.info("Successfully created event: %s", event_name)
                 return "Success: Event created successfully."
     except Exception as e:
-        print(f"Error creating event: {e}")
+        log.exception("Error creating event")
         # Rollback is handled by the connection pool/transaction manager if an error occurs
         return f"An unexpected error occurred: {e}"
 
-def get_all_events():
+def create_events_bulk(current_user_role, rows):
     """
-    Retrieves a list of all events from the database.
+    Creates many events in one batch, e.g. for an admin import.
+    `rows` is a list of dicts with the same fields as create_event. Every row is
+    validated first; valid rows are inserted with a single executemany call and
+    one commit. Returns (summary_message, errors) where errors is a list of
+    (row_index, message) for rows that were rejected.
     """
+    if current_user_role != 'admin':
+        return "Error: Administrative privileges required.", []
+
+    errors = []
+    cleaned_rows = []
+    row_indexes = []
+    for index, row in enumerate(rows):
+        try:
+            cleaned_rows.append(_validate_event_row(row))
+            row_indexes.append(index)
+        except ValueError as e:
+            errors.append((index, str(e)))
+
+    if not cleaned_rows:
+        return "Error: No valid events to create.", errors
+
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = "SELECT event_id, event_name, event_date, event_time, venue, total_slots FROM EVENTS ORDER BY event_date DESC"
-                cursor.execute(query)
-                return cursor.fetchall()
+                cursor.executemany(_SQL_CREATE_EVENT, cleaned_rows, batcherrors=True)
+                for batch_error in cursor.getbatcherrors():
+                    errors.append((row_indexes[batch_error.offset], f"A database error occurred: {batch_error.message}"))
+                conn.commit()
+        _invalidate_events_cache()
     except Exception as e:
-        print(f"Error fetching events: {e}")
+        log.exception("Error creating events in bulk")
+        return f"An unexpected error occurred: {e}", errors
+
+    errors.sort()
+    created = len(rows) - len(errors)
+    return f"Success: {created} of {len(rows)} event(s) created.", errors
+
+def get_all_events():
+    """
+    Retrieves a list of all events from the database.
+    Results are served from a short-lived in-process cache when available.
+    """
+    with _CACHE_LOCK:
+        if _ALL_EVENTS_CACHE['data'] is not None and time.monotonic() - _ALL_EVENTS_CACHE['ts'] < _CACHE_TTL_SECONDS:
+            return _ALL_EVENTS_CACHE['data']
+        generation = _cache_generation
+
+    try:
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_GET_ALL_EVENTS)
+            all_events = cursor.fetchall()
+        with _CACHE_LOCK:
+            if generation == _cache_generation:
+                _ALL_EVENTS_CACHE['data'] = all_events
+                _ALL_EVENTS_CACHE['ts'] = time.monotonic()
+        return all_events
+    except Exception:
+        log.exception("Error fetching events")
         return []
 
+def get_dropdown_choices():
+    """
+    Returns (labels, id_by_label) for event selection dropdowns, where each
+    label reads "<id>: <name>". Built once per get_all_events() result and
+    reused until that result is refreshed; callers must not modify them.
+    """
+    all_events = get_all_events()
+    with _CACHE_LOCK:
+        cached = _ALL_EVENTS_CACHE['choices']
+        if cached and cached[0] is all_events:
+            return cached[1]
+
+    # One pass builds both the label list and the label -> id map
+    labels = []
+    id_by_label = {}
+    for event_id, event_name, *_ in all_events:
+        label = f"{event_id}: {event_name}"
+        labels.append(label)
+        id_by_label[label] = event_id
+    choices = (tuple(labels), id_by_label)
+    with _CACHE_LOCK:
+        # Only memoize choices for the list that is actually cached
+        if _ALL_EVENTS_CACHE['data'] is all_events:
+            _ALL_EVENTS_CACHE['choices'] = (all_events, choices)
+    return choices
+
 def get_event_details(event_id):
     """
     Retrieves details for a single event from the database.
+    Results are served from a short-lived in-process cache when available.
     """
+    with _CACHE_LOCK:
+        cached = _EVENTS_CACHE.get(event_id)
+        if cached and time.monotonic() - cached[0] < _CACHE_TTL_SECONDS:
+            return cached[1]
+        generation = _cache_generation
+
     try:
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                query = "SELECT event_id, event_name, event_date, event_time, venue, total_slots FROM EVENTS WHERE event_id = :event_id"
-                cursor.execute(query, {'event_id': event_id})
-                return cursor.fetchone()
-    except Exception as e:
-        print(f"Error fetching event details for event_id {event_id}: {e}")
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_GET_EVENT_DETAILS, {'event_id': event_id})
+            event = cursor.fetchone()
+        if event:
+            with _CACHE_LOCK:
+                if generation == _cache_generation:
+                    _EVENTS_CACHE[event_id] = (time.monotonic(), event)
+        return event
+    except Exception:
+        log.exception("Error fetching event details for event_id %s", event_id)
         return None
 
 
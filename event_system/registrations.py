@@ -4,6 +4,78 @@
 from . import db
 from . import auth
 import datetime
+import logging
+import oracledb
+
+log = logging.getLogger(__name__)
+
+# --- SQL Statements ---
+# Kept at module level so every call passes the identical string object and the
+# driver's statement cache (see db.init_pool) can reuse the parsed statement.
+
+# Capacity, student existence and duplicate registration are all checked by the
+# INSERT itself. The COUNT(*) capacity check alone would let two sessions
+# registering different students both see a free slot and overbook the event,
+# so the block first locks the event row: registrations for the same event take
+# turns, registrations for other events are unaffected. Under READ COMMITTED the
+# INSERT, which runs once the lock is granted, counts every registration
+# committed by the previous holder. The uk_event_student constraint only
+# guards against the same student being registered twice.
+_SQL_REGISTER_STUDENT = """
+BEGIN
+    UPDATE EVENTS SET total_slots = total_slots WHERE event_id = :event_id;
+    INSERT INTO REGISTRATIONS (event_id, student_id, reg_date)
+    SELECT :event_id, :student_id, :reg_date
+    FROM EVENTS e
+    WHERE e.event_id = :event_id
+      AND (SELECT COUNT(*) FROM REGISTRATIONS WHERE event_id = :event_id) < e.total_slots
+      AND NOT EXISTS (SELECT 1 FROM REGISTRATIONS WHERE event_id = :event_id AND student_id = :student_id)
+      AND EXISTS (SELECT 1 FROM STUDENTS WHERE student_id = :student_id);
+    :inserted := SQL%ROWCOUNT;
+END;
+"""
+
+_SQL_REGISTER_DIAGNOSTIC = """
+SELECT
+    (SELECT 1 FROM EVENTS WHERE event_id = :event_id) AS event_exists,
+    (SELECT 1 FROM STUDENTS WHERE student_id = :student_id) AS student_exists,
+    (SELECT 1 FROM REGISTRATIONS WHERE event_id = :event_id AND student_id = :student_id) AS already_registered
+FROM dual
+"""
+
+_SQL_GET_REGISTERED_STUDENTS = """
+SELECT s.student_id, s.name, s.email, r.reg_date
+FROM STUDENTS s
+JOIN REGISTRATIONS r ON s.student_id = r.student_id
+WHERE r.event_id = :event_id
+ORDER BY s.name
+"""
+
+# The same columns as _SQL_GET_REGISTERED_STUDENTS, for a single registration
+_SQL_GET_STUDENT_REGISTRATION = """
+SELECT s.student_id, s.name, s.email, r.reg_date
+FROM STUDENTS s
+JOIN REGISTRATIONS r ON s.student_id = r.student_id
+WHERE r.event_id = :event_id AND r.student_id = :student_id
+"""
+
+# Only the column needed to send notifications crosses the network
+_SQL_GET_RECIPIENT_EMAILS = """
+SELECT s.email
+FROM STUDENTS s
+JOIN REGISTRATIONS r ON s.student_id = r.student_id
+WHERE r.event_id = :event_id
+  AND s.email IS NOT NULL
+"""
+
+# Deletes any attendance records and then the registration itself in a single
+# server round-trip.
+_SQL_CANCEL_REGISTRATION = """
+BEGIN
+    DELETE FROM ATTENDANCE WHERE event_id = :event_id AND student_id = :student_id;
+    DELETE FROM REGISTRATIONS WHERE event_id = :event_id AND student_id = :student_id;
+END;
+"""
 
 def register_student_for_event(current_user_role, event_id, student_id):
     """
@@ -18,49 +90,38 @@ def register_student_for_event(current_user_role, event_id, student_id):
             # Using a transaction context manager ensures atomicity.
             # It will automatically commit if the block succeeds, or rollback if it fails.
             with conn.cursor() as cursor:
-                # --- Check 1: Event Capacity and Existence (with row lock) ---
-                cursor.execute("SELECT total_slots FROM EVENTS WHERE event_id = :event_id FOR UPDATE", {'event_id': event_id})
-                event_result = cursor.fetchone()
-                if not event_result:
-                    return "Error: Event not found."
-                total_slots = event_result[0]
-
-                # --- Check 2: Student Existence ---
-                cursor.execute("SELECT name FROM STUDENTS WHERE student_id = :student_id", {'student_id': student_id})
-                if not cursor.fetchone():
-                    return "Error: Student not found."
-
-                # --- Check 3: Already Registered ---
-                cursor.execute(
-                    "SELECT reg_id FROM REGISTRATIONS WHERE event_id = :event_id AND student_id = :student_id",
-                    {'event_id': event_id, 'student_id': student_id}
-                )
-                if cursor.fetchone():
-                    return "Info: Student is already registered for this event."
-
-                # --- Check 4: Capacity Check ---
-                cursor.execute("SELECT COUNT(*) FROM REGISTRATIONS WHERE event_id = :event_id", {'event_id': event_id})
-                registered_count = cursor.fetchone()[0]
-                
-                if registered_count >= total_slots:
-                    return "Error: Event is full. Cannot register."
-
-                # --- If all checks pass, proceed with registration ---
-                insert_query = """
-                INSERT INTO REGISTRATIONS (event_id, student_id, reg_date)
-                VALUES (:event_id, :student_id, :reg_date)
-                """
-                cursor.execute(insert_query, {
+                # --- Conditional insert ---
+                inserted = cursor.var(int)
+                cursor.execute(_SQL_REGISTER_STUDENT, {
                     'event_id': event_id,
                     'student_id': student_id,
-                    'reg_date': datetime.datetime.now()
+                    'reg_date': datetime.datetime.now(),
+                    'inserted': inserted
                 })
-                
+
+                if not inserted.getvalue():
+                    # --- Nothing inserted: find out which rule rejected it ---
+                    cursor.execute(_SQL_REGISTER_DIAGNOSTIC, {'event_id': event_id, 'student_id': student_id})
+                    event_exists, student_exists, already_registered = cursor.fetchone()
+                    if not event_exists:
+                        return "Error: Event not found."
+                    if not student_exists:
+                        return "Error: Student not found."
+                    if already_registered:
+                        return "Info: Student is already registered for this event."
+                    return "Error: Event is full. Cannot register."
+
                 conn.commit()
                 return "Success: Student registered successfully."
 
+    except oracledb.IntegrityError as e:
+        error_obj, = e.args
+        if "UK_EVENT_STUDENT" in error_obj.message:
+            return "Info: Student is already registered for this event."
+        log.exception("Error during registration")
+        return f"A database integrity error occurred: {e}"
     except Exception as e:
-        print(f"Error during registration: {e}")
+        log.exception("Error during registration")
         # The transaction is automatically rolled back by the 'with' statement on exception
         return f"An unexpected error occurred: {e}"
 
@@ -69,19 +130,39 @@ def get_registered_students(event_id):
     Retrieves a list of students registered for a given event.
     """
     try:
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                query = """
-                SELECT s.student_id, s.name, s.email, r.reg_date
-                FROM STUDENTS s
-                JOIN REGISTRATIONS r ON s.student_id = r.student_id
-                WHERE r.event_id = :event_id
-                ORDER BY s.name
-                """
-                cursor.execute(query, {'event_id': event_id})
-                return cursor.fetchall()
-    except Exception as e:
-        print(f"Error fetching registered students: {e}")
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_GET_REGISTERED_STUDENTS, {'event_id': event_id})
+            db.use_named_rows(cursor)
+            return cursor.fetchall()
+    except Exception:
+        log.exception("Error fetching registered students")
+        return []
+
+def get_student_registration(event_id, student_id):
+    """
+    Retrieves one student's registration for an event, as a row shaped like
+    those of get_registered_students, or None if there is none.
+    """
+    try:
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_GET_STUDENT_REGISTRATION, {'event_id': event_id, 'student_id': student_id})
+            db.use_named_rows(cursor)
+            return cursor.fetchone()
+    except Exception:
+        log.exception("Error fetching registration of student %s for event %s", student_id, event_id)
+        return None
+
+def get_recipient_emails(event_id):
+    """
+    Retrieves the email addresses of the students registered for an event.
+    """
+    try:
+        with db.cursor() as cursor:
+            db.tune_for_bulk_fetch(cursor)
+            cursor.execute(_SQL_GET_RECIPIENT_EMAILS, {'event_id': event_id})
+            return [email for email, in cursor]
+    except Exception:
+        log.exception("Error fetching recipient emails")
         return []
 
 def cancel_registration(current_user_role, event_id, student_id):
@@ -95,22 +176,12 @@ def cancel_registration(current_user_role, event_id, student_id):
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                # First, delete any attendance records for this registration
-                cursor.execute(
-                    "DELETE FROM ATTENDANCE WHERE event_id = :1 AND student_id = :2",
-                    [event_id, student_id]
-                )
-                
-                # Then, delete the registration itself
-                cursor.execute(
-                    "DELETE FROM REGISTRATIONS WHERE event_id = :1 AND student_id = :2",
-                    [event_id, student_id]
-                )
-                
+                cursor.execute(_SQL_CANCEL_REGISTRATION, {'event_id': event_id, 'student_id': student_id})
+
                 conn.commit()
                 return "Success: Registration canceled successfully."
     except Exception as e:
-        print(f"Error canceling registration: {e}")
+        log.exception("Error canceling registration")
         return f"An unexpected error occurred: {e}"
 
 if __name__ == '__main__':
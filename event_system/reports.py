@@ -1,139 +1,324 @@
 # reports.py
 # Generates statistics and handles CSV exports for event attendance.
 
+import collections
 import csv
+import logging
 import os
+import tempfile
+import threading
+from xml.sax.saxutils import escape as xml_escape
 from . import db
 
+log = logging.getLogger(__name__)
+
+# --- SQL Statements ---
+# Kept at module level so every call passes the identical string object and the
+# driver's statement cache (see db.init_pool) can reuse the parsed statement.
+
+# Fetches the event name, registration count and attended count in one round-trip.
+# Scalar subqueries keep both counts at 0 (not NULL) for events with no registrations.
+_SQL_EVENT_STATISTICS = """
+SELECT
+    e.event_name,
+    (SELECT COUNT(*) FROM REGISTRATIONS r WHERE r.event_id = e.event_id) AS total_registered,
+    (SELECT COUNT(*) FROM ATTENDANCE a WHERE a.event_id = e.event_id AND a.attended = 'Y') AS total_attended
+FROM EVENTS e
+WHERE e.event_id = :event_id
+"""
+
+# The same counts for every event at once, so a screen can prefetch them all
+_SQL_ALL_EVENT_STATISTICS = """
+SELECT
+    e.event_id,
+    e.event_name,
+    (SELECT COUNT(*) FROM REGISTRATIONS r WHERE r.event_id = e.event_id) AS total_registered,
+    (SELECT COUNT(*) FROM ATTENDANCE a WHERE a.event_id = e.event_id AND a.attended = 'Y') AS total_attended
+FROM EVENTS e
+"""
+
+_SQL_EVENT_EXISTS = "SELECT event_name FROM EVENTS WHERE event_id = :event_id"
+
+# Text columns are sanitized against CSV injection in SQL: values starting
+# with '=', '+', '-' or '@' get a leading single quote.
+_SQL_EXPORT_ATTENDANCE = """
+SELECT
+    CASE WHEN SUBSTR(s.student_id, 1, 1) IN ('=', '+', '-', '@')
+         THEN '''' || s.student_id ELSE s.student_id END AS student_id,
+    CASE WHEN SUBSTR(s.name, 1, 1) IN ('=', '+', '-', '@')
+         THEN '''' || s.name ELSE s.name END AS name,
+    NVL(a.attended, 'N') AS attendance_status
+FROM REGISTRATIONS r
+JOIN STUDENTS s ON r.student_id = s.student_id
+LEFT JOIN ATTENDANCE a ON r.event_id = a.event_id AND r.student_id = a.student_id
+WHERE r.event_id = :event_id
+ORDER BY s.name
+"""
+
+# Writes the same export on the database host with UTL_FILE, so rows never
+# cross the network. Student IDs and names are always quoted, with embedded
+# quotes doubled, since either may contain commas, quotes or line breaks.
+_SQL_EXPORT_ATTENDANCE_SERVER = """
+DECLARE
+    l_file UTL_FILE.FILE_TYPE;
+BEGIN
+    :row_count := 0;
+    l_file := UTL_FILE.FOPEN(:directory_name, :file_name, 'w', 32767);
+    UTL_FILE.PUT_LINE(l_file, 'Student ID,Student Name,Attendance Status (Y/N)');
+    FOR rec IN (
+        SELECT
+            CASE WHEN SUBSTR(s.student_id, 1, 1) IN ('=', '+', '-', '@')
+                 THEN '''' || s.student_id ELSE s.student_id END AS student_id,
+            CASE WHEN SUBSTR(s.name, 1, 1) IN ('=', '+', '-', '@')
+                 THEN '''' || s.name ELSE s.name END AS name,
+            NVL(a.attended, 'N') AS attendance_status
+        FROM REGISTRATIONS r
+        JOIN STUDENTS s ON r.student_id = s.student_id
+        LEFT JOIN ATTENDANCE a ON r.event_id = a.event_id AND r.student_id = a.student_id
+        WHERE r.event_id = :event_id
+        ORDER BY s.name
+    ) LOOP
+        UTL_FILE.PUT_LINE(l_file, '"' || REPLACE(rec.student_id, '"', '""') || '","'
+                                  || REPLACE(rec.name, '"', '""') || '",' || rec.attendance_status);
+        :row_count := :row_count + 1;
+    END LOOP;
+    UTL_FILE.FCLOSE(l_file);
+EXCEPTION
+    WHEN OTHERS THEN
+        IF UTL_FILE.IS_OPEN(l_file) THEN
+            UTL_FILE.FCLOSE(l_file);
+        END IF;
+        RAISE;
+END;
+"""
+
+# CSV exports are written through a 1 MiB buffer to keep write syscalls few
+_CSV_BUFFER_SIZE = 1 << 20
+
+# --- Attendance Chart Layout ---
+# The chart is two plain bars, so it is drawn as SVG (web) or on a Tk canvas
+# (desktop) from the same geometry instead of going through a plotting library.
+CHART_WIDTH = 400
+CHART_HEIGHT = 300
+_CHART_MARGIN_LEFT = 60
+_CHART_MARGIN_RIGHT = 20
+_CHART_MARGIN_TOP = 40
+_CHART_MARGIN_BOTTOM = 40
+_CHART_BAR_COLORS = ('skyblue', 'lightgreen')
+
+# --- Chart File Cache ---
+# Rendered chart files are reused while an event's numbers are unchanged, so
+# reloading the reports page doesn't write a new file every time. The least
+# recently used files are deleted once more than _CHART_CACHE_SIZE are kept.
+_CHART_CACHE_SIZE = 32
+_CHART_CACHE_LOCK = threading.Lock()
+_CHART_CACHE = collections.OrderedDict()  # (event_id, name, registered, attended) -> file path
+
 def get_event_statistics(event_id):
     """
     Calculates attendance statistics for a specific event.
     """
     try:
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                # Check if event exists
-                cursor.execute("SELECT event_name FROM EVENTS WHERE event_id = :event_id", {'event_id': event_id})
-                event_name_tuple = cursor.fetchone()
-                if not event_name_tuple:
-                    print(f"No event found with ID: {event_id}")
-                    return None
-                
-                event_name = event_name_tuple[0]
-
-                # Get total registered students
-                cursor.execute("SELECT COUNT(*) FROM REGISTRATIONS WHERE event_id = :event_id", {'event_id': event_id})
-                total_registered = cursor.fetchone()[0]
-
-                # Get total attended students
-                cursor.execute(
-                    "SELECT COUNT(*) FROM ATTENDANCE WHERE event_id = :event_id AND attended = 'Y'",
-                    {'event_id': event_id}
-                )
-                total_attended = cursor.fetchone()[0]
-
-                # Calculate attendance percentage
-                percentage = (total_attended / total_registered) * 100 if total_registered > 0 else 0
-
-                return {
-                    'event_name': event_name,
-                    'registered': total_registered,
-                    'attended': total_attended,
-                    'percentage': round(percentage, 2)
-                }
-    except Exception as e:
-        print(f"Error calculating statistics for event {event_id}: {e}")
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_EVENT_STATISTICS, {'event_id': event_id})
+            result = cursor.fetchone()
+            if not result:
+                log.info("No event found with ID: %s", event_id)
+                return None
+
+            return _statistics(*result)
+    except Exception:
+        log.exception("Error calculating statistics for event %s", event_id)
         return None
 
-def generate_attendance_chart(event_id):
+def get_all_event_statistics():
     """
-    Generates a bar chart for event attendance and saves it to a temporary file.
+    Calculates attendance statistics for every event in one query.
+    Returns a dict of event_id -> statistics (as from get_event_statistics).
     """
-    stats = get_event_statistics(event_id)
-    if not stats or stats['registered'] == 0:
-        return None
-
     try:
-        import matplotlib
-        matplotlib.use('Agg') # Use non-interactive backend
-        import matplotlib.pyplot as plt
-        import tempfile
+        with db.cursor() as cursor:
+            cursor.execute(_SQL_ALL_EVENT_STATISTICS)
+            return {event_id: _statistics(*counts) for event_id, *counts in cursor}
+    except Exception:
+        log.exception("Error calculating statistics for all events")
+        return {}
 
-        labels = ['Registered', 'Attended']
-        values = [stats['registered'], stats['attended']]
+def _statistics(event_name, total_registered, total_attended):
+    """Builds the statistics dict for one event from its counts."""
+    # Calculate attendance percentage
+    percentage = (total_attended / total_registered) * 100 if total_registered > 0 else 0
 
-        fig, ax = plt.subplots()
-        bars = ax.bar(labels, values, color=['skyblue', 'lightgreen'])
-        
-        ax.set_ylabel('Number of Students')
-        ax.set_title(f'Attendance for: {stats["event_name"]}')
-        ax.set_ylim(0, max(values) * 1.1) # Add some space at the top
+    return {
+        'event_name': event_name,
+        'registered': total_registered,
+        'attended': total_attended,
+        'percentage': round(percentage, 2)
+    }
+
+def attendance_chart_bars(stats, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """
+    Computes the bar geometry for an attendance chart.
+    Returns the plot area as (left, top, right, bottom) and a list of
+    (label, value, x0, y0, x1, y1, color) tuples, one per bar.
+    """
+    left = _CHART_MARGIN_LEFT
+    top = _CHART_MARGIN_TOP
+    right = width - _CHART_MARGIN_RIGHT
+    bottom = height - _CHART_MARGIN_BOTTOM
+
+    labels = ['Registered', 'Attended']
+    values = [stats['registered'], stats['attended']]
+    max_value = max(values) * 1.1 or 1 # Add some space at the top
+
+    slot_width = (right - left) / len(values)
+    bar_width = slot_width * 0.5
+    bars = []
+    for i, (label, value, color) in enumerate(zip(labels, values, _CHART_BAR_COLORS)):
+        x0 = left + slot_width * i + (slot_width - bar_width) / 2
+        y0 = bottom - (bottom - top) * value / max_value
+        bars.append((label, value, x0, y0, x0 + bar_width, bottom, color))
+    return (left, top, right, bottom), bars
+
+def render_attendance_chart_svg(stats, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """
+    Renders the attendance bar chart for the given statistics as an SVG string.
+    """
+    (left, top, right, bottom), bars = attendance_chart_bars(stats, width, height)
+    title = xml_escape(f"Attendance for: {stats['event_name']}")
+    mid_y = (top + bottom) / 2
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="12">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        f'<text x="{width / 2}" y="{top / 2 + 5}" text-anchor="middle" font-size="14">{title}</text>',
+        f'<text x="18" y="{mid_y}" text-anchor="middle" transform="rotate(-90 18 {mid_y})">Number of Students</text>',
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{bottom}" stroke="black"/>',
+        f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="black"/>',
+    ]
+    for label, value, x0, y0, x1, y1, color in bars:
+        center = (x0 + x1) / 2
+        parts.append(f'<rect x="{x0:.1f}" y="{y0:.1f}" width="{x1 - x0:.1f}" height="{y1 - y0:.1f}" fill="{color}"/>')
+        parts.append(f'<text x="{center:.1f}" y="{y0 - 4:.1f}" text-anchor="middle">{int(value)}</text>')
+        parts.append(f'<text x="{center:.1f}" y="{bottom + 16}" text-anchor="middle">{label}</text>')
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+def generate_attendance_chart(event_id, stats=None):
+    """
+    Generates an SVG bar chart for event attendance and saves it to a temporary file.
+    Pass `stats` from get_event_statistics to skip querying them again. The
+    file is reused for as long as the event's statistics stay the same.
+    """
+    if stats is None:
+        stats = get_event_statistics(event_id)
+    if not stats or stats['registered'] == 0:
+        return None
+
+    key = (event_id, stats['event_name'], stats['registered'], stats['attended'])
+    with _CHART_CACHE_LOCK:
+        chart_path = _CHART_CACHE.get(key)
+        if chart_path and os.path.exists(chart_path):
+            _CHART_CACHE.move_to_end(key)
+            return os.path.join('static', os.path.basename(chart_path))
 
-        # Add number labels on top of bars
-        for bar in bars:
-            yval = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2.0, yval, int(yval), va='bottom')
+    try:
+        svg = render_attendance_chart_svg(stats)
 
         # Save to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir='./event_system/static') as tmpfile:
+        with tempfile.NamedTemporaryFile('w', delete=False, suffix='.svg', dir='./event_system/static', encoding='utf-8') as tmpfile:
             chart_path = tmpfile.name
-            plt.savefig(chart_path)
-            plt.close(fig) # Close the figure to free up memory
-        
+            tmpfile.write(svg)
+
+        stale_paths = []
+        with _CHART_CACHE_LOCK:
+            cached_path = _CHART_CACHE.get(key)
+            if cached_path and os.path.exists(cached_path):
+                # Another request rendered the same chart meanwhile; keep theirs
+                stale_paths.append(chart_path)
+                chart_path = cached_path
+            _CHART_CACHE[key] = chart_path
+            _CHART_CACHE.move_to_end(key)
+            while len(_CHART_CACHE) > _CHART_CACHE_SIZE:
+                stale_paths.append(_CHART_CACHE.popitem(last=False)[1])
+        for stale_path in stale_paths:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass  # Already gone
+
         # Return a web-accessible path
         return os.path.join('static', os.path.basename(chart_path))
         
-    except Exception as e:
-        print(f"Error generating attendance chart: {e}")
+    except Exception:
+        log.exception("Error generating attendance chart")
         return None
 
-def sanitize_for_csv(value):
-    """
-    Sanitizes a value to prevent CSV injection.
-    If the value starts with '=', '+', '-', or '@', it prepends a single quote.
-    """
-    if isinstance(value, str) and value.startswith(('=', '+', '-', '@')):
-        return "'" + value
-    return value
-
 def export_attendance_to_csv(event_id, full_file_path):
     """
     Exports the attendance list for an event to a CSV file.
     Expects `full_file_path` to be the complete path including filename.
     """
     try:
+        full_file_path = os.path.abspath(full_file_path)
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                # Check if event exists
-                cursor.execute("SELECT event_name FROM EVENTS WHERE event_id = :event_id", {'event_id': event_id})
+                # Fetch the attendance data
+                db.tune_for_bulk_fetch(cursor)
+                cursor.execute(_SQL_EXPORT_ATTENDANCE, {'event_id': event_id})
+                first_row = cursor.fetchone()
+
+                if first_row is None:
+                    # Only an empty result needs the extra lookup to tell a
+                    # missing event apart from one without registrations
+                    cursor.execute(_SQL_EVENT_EXISTS, {'event_id': event_id})
+                    if not cursor.fetchone():
+                        return "Error: Event not found."
+                    return "Info: No registrations found for this event. Nothing to export."
+
+                # Stream rows from the cursor into the file so fetching and writing
+                # interleave and only one batch of rows is held in memory.
+                with open(full_file_path, 'w', newline='', buffering=_CSV_BUFFER_SIZE, encoding='utf-8') as csvfile:
+                    csv_writer = csv.writer(csvfile)
+                    csv_writer.writerow(['Student ID', 'Student Name', 'Attendance Status (Y/N)'])
+                    csv_writer.writerow(first_row)
+                    csv_writer.writerows(cursor)
+
+        return f"Success: Attendance data exported to {full_file_path}"
+
+    except Exception as e:
+        log.exception("Error exporting attendance to CSV for event %s", event_id)
+        return f"Error: Failed to export attendance data. Reason: {e}"
+
+def export_attendance_to_csv_server(event_id, directory_name):
+    """
+    Exports the attendance list for an event to a CSV file written by the
+    database server itself, for very large events. `directory_name` is an
+    Oracle DIRECTORY object the schema can write to. The file is named
+    attendance_event_<id>.csv; use export_attendance_to_csv when the file is
+    needed on the client machine.
+    """
+    file_name = f"attendance_event_{event_id}.csv"
+    try:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(_SQL_EVENT_EXISTS, {'event_id': event_id})
                 if not cursor.fetchone():
                     return "Error: Event not found."
 
-                # Fetch the attendance data
-                query = """
-                SELECT s.student_id, s.name, NVL(a.attended, 'N') AS attendance_status
-                FROM REGISTRATIONS r
-                JOIN STUDENTS s ON r.student_id = s.student_id
-                LEFT JOIN ATTENDANCE a ON r.event_id = a.event_id AND r.student_id = a.student_id
-                WHERE r.event_id = :event_id
-                ORDER BY s.name
-                """
-                cursor.execute(query, {'event_id': event_id})
-                attendance_data = cursor.fetchall()
-                
-                if not attendance_data:
-                    return "Info: No registrations found for this event. Nothing to export."
+                row_count = cursor.var(int)
+                cursor.execute(_SQL_EXPORT_ATTENDANCE_SERVER, {
+                    'directory_name': directory_name,
+                    'file_name': file_name,
+                    'event_id': event_id,
+                    'row_count': row_count
+                })
 
-        # Sanitize data and write to the specified full_file_path
-        with open(full_file_path, 'w', newline='') as csvfile:
-            csv_writer = csv.writer(csvfile)
-            csv_writer.writerow(['Student ID', 'Student Name', 'Attendance Status (Y/N)'])
-            # Sanitize each cell before writing
-            sanitized_data = [[sanitize_for_csv(cell) for cell in row] for row in attendance_data]
-            csv_writer.writerows(sanitized_data)
-        
-        return f"Success: Attendance data exported to {os.path.abspath(full_file_path)}"
+        if not row_count.getvalue():
+            return "Info: No registrations found for this event. Nothing to export."
+        return f"Success: Attendance data exported on the database server to {directory_name}/{file_name}"
 
     except Exception as e:
-        print(f"Error exporting attendance to CSV for event {event_id}: {e}")
+        log.exception("Error exporting attendance on the server for event %s", event_id)
         return f"Error: Failed to export attendance data. Reason: {e}"
@@ -3,153 +3,316 @@
 
 from . import db
 from . import auth
+import contextlib
+import logging
 import re
 import oracledb
 
-def add_student(current_user_role, student_id, name, email, course, year):
+log = logging.getLogger(__name__)
+
+# Basic email format check, compiled once instead of on every add/update
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# Pulls the constraint name out of an ORA-00001 message, e.g.
+# "ORA-00001: unique constraint (APP.UK_STUDENT_EMAIL) violated"
+_ORA_UNIQUE_RE = re.compile(r'\((?:[^.]+\.)?([A-Z0-9_]+)\)')
+_UNIQUE_MSG = {
+    'PK_STUDENTS': "Error: Student with ID '{student_id}' already exists.",
+    'UK_STUDENT_EMAIL': "Error: A student with the email '{email}' already exists."
+}
+
+# --- SQL Statements ---
+# Kept at module level so every call passes the identical string object and the
+# driver's statement cache (see db.init_pool) can reuse the parsed statement.
+
+_SQL_INSERT_STUDENT = """
+INSERT INTO STUDENTS (student_id, name, email, course, year)
+VALUES (:student_id, :name, :email, :course, :year)
+"""
+
+_SQL_GET_ALL_STUDENTS = "SELECT student_id, name, email, course, year FROM STUDENTS ORDER BY name"
+
+_SQL_GET_STUDENT_BY_ID = "SELECT student_id, name, email, course, year FROM STUDENTS WHERE student_id = :student_id"
+
+_SQL_UPDATE_STUDENT = """
+UPDATE STUDENTS
+SET name = :name, email = :email, course = :course, year = :year
+WHERE student_id = :student_id
+"""
+
+# Same update, but hands the stored row back in the same round-trip
+_SQL_UPDATE_STUDENT_RETURNING = """
+UPDATE STUDENTS
+SET name = :name, email = :email, course = :course, year = :year
+WHERE student_id = :student_id
+RETURNING student_id, name, email, course, year
+INTO :out_student_id, :out_name, :out_email, :out_course, :out_year
+"""
+
+_SQL_DELETE_STUDENT = "DELETE FROM STUDENTS WHERE student_id = :student_id"
+
+def _unique_violation_message(error_message, student_id, email):
+    """
+    Returns the user-facing message for a duplicate student ID or email, or
+    None if the error is about some other constraint.
+    """
+    match = _ORA_UNIQUE_RE.search(error_message)
+    template = _UNIQUE_MSG.get(match.group(1)) if match else None
+    return template.format(student_id=student_id, email=email) if template else None
+
+def _student_connection(connection):
+    """
+    Returns a context manager for the connection to run a student change on:
+    the caller's connection when one is given (left open), otherwise a pooled one.
+    """
+    if connection is not None:
+        return contextlib.nullcontext(connection)
+    return db.get_connection()
+
+def commit_students(connection):
+    """
+    Commits student changes made with an explicit `connection`, so a batch of
+    add/update/delete calls costs a single commit.
+    """
+    connection.commit()
+
+def _validate_student_fields(student_id, name, email, year):
+    """
+    Checks the fields shared by student inserts and updates.
+    Returns (error_message, year_int); error_message is None when valid.
+    """
+    if not (student_id and name and email):
+        return "Error: Student ID, Name, and Email are required.", None
+
+    # Basic email format validation
+    if not _EMAIL_RE.match(email):
+        return "Error: Invalid email format.", None
+
+    try:
+        year_int = int(year)
+    except (ValueError, TypeError):
+        return "Error: Year must be a valid number.", None
+    if year_int <= 0:
+        return "Error: Year must be a positive number.", None
+    return None, year_int
+
+def add_student(current_user_role, student_id, name, email, course, year, connection=None):
     """
     Adds a new student to the database after validating inputs.
     This action is restricted to admin users and handles race conditions.
+    If `connection` is given the insert runs on it and is not committed; call
+    commit_students(connection) once the batch is done.
     """
     if current_user_role != 'admin':
         return "Error: Administrative privileges required."
 
     # --- Input Validation ---
-    if not all([student_id, name, email]):
-        return "Error: Student ID, Name, and Email are required."
-    
-    # Basic email format validation
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        return "Error: Invalid email format."
-        
-    try:
-        year_int = int(year)
-        if year_int <= 0:
-            return "Error: Year must be a positive number."
-    except (ValueError, TypeError):
-        return "Error: Year must be a valid number."
+    error, year_int = _validate_student_fields(student_id, name, email, year)
+    if error:
+        return error
 
     try:
-        with db.get_connection() as conn:
+        with _student_connection(connection) as conn:
             with conn.cursor() as cursor:
-                query = """
-                INSERT INTO STUDENTS (student_id, name, email, course, year)
-                VALUES (:student_id, :name, :email, :course, :year)
-                """
-                cursor.execute(query, {
+                cursor.execute(_SQL_INSERT_STUDENT, {
                     'student_id': student_id,
                     'name': name,
                     'email': email,
                     'course': course,
                     'year': year_int
                 })
-                conn.commit()
+                if connection is None:
+                    conn.commit()
                 return "Success: Student added successfully."
     except oracledb.IntegrityError as e:
         error_obj, = e.args
-        # Assuming the student_id is the primary key (PK) and email has a unique constraint (UK_EMAIL)
-        if "PK_STUDENTS" in error_obj.message:
-            return f"Error: Student with ID '{student_id}' already exists."
-        elif "UK_STUDENT_EMAIL" in error_obj.message: # Adjusted constraint name for likely convention
-            return f"Error: A student with the email '{email}' already exists."
-        else:
-            return f"A database integrity error occurred: {e}"
+        message = _unique_violation_message(error_obj.message, student_id, email)
+        return message or f"A database integrity error occurred: {e}"
     except oracledb.DatabaseError as e:
         return f"A database error occurred: {e}"
     except Exception as e:
         return f"An unexpected error occurred: {e}"
 
-def get_all_students():
+def add_students(current_user_role, rows):
     """
-    Retrieves a list of all students from the database.
+    Adds many students in one batch, e.g. when importing a class list.
+    `rows` is a list of dicts with the same fields as add_student. Every row is
+    validated first; valid rows are inserted with a single executemany call and
+    one commit. Returns (summary_message, errors) where errors is a list of
+    (row_index, message) for rows that were rejected.
     """
+    if current_user_role != 'admin':
+        return "Error: Administrative privileges required.", []
+
+    errors = []
+    valid_rows = []
+    row_indexes = []
+    for index, row in enumerate(rows):
+        student_id = row.get('student_id')
+        name = row.get('name')
+        email = row.get('email')
+        error, year_int = _validate_student_fields(student_id, name, email, row.get('year'))
+        if error:
+            errors.append((index, error))
+            continue
+        valid_rows.append({
+            'student_id': student_id,
+            'name': name,
+            'email': email,
+            'course': row.get('course'),
+            'year': year_int
+        })
+        row_indexes.append(index)
+
+    if not valid_rows:
+        return "Error: No valid students to add.", errors
+
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = "SELECT student_id, name, email, course, year FROM STUDENTS ORDER BY name"
-                cursor.execute(query)
-                return cursor.fetchall()
+                cursor.executemany(_SQL_INSERT_STUDENT, valid_rows, batcherrors=True)
+                for batch_error in cursor.getbatcherrors():
+                    row = valid_rows[batch_error.offset]
+                    message = (_unique_violation_message(batch_error.message, row['student_id'], row['email'])
+                               or f"A database error occurred: {batch_error.message}")
+                    errors.append((row_indexes[batch_error.offset], message))
+                conn.commit()
+    except oracledb.DatabaseError as e:
+        return f"A database error occurred: {e}", errors
     except Exception as e:
-        print(f"Error fetching students: {e}")
+        return f"An unexpected error occurred: {e}", errors
+
+    errors.sort()
+    added = len(rows) - len(errors)
+    return f"Success: {added} of {len(rows)} student(s) added.", errors
+
+def get_all_students():
+    """
+    Retrieves a list of all students from the database.
+    """
+    try:
+        with db.cursor() as cursor:
+            db.tune_for_bulk_fetch(cursor)
+            cursor.execute(_SQL_GET_ALL_STUDENTS)
+            return cursor.fetchall()
+    except Exception:
+        log.exception("Error fetching students")
         return []
 
-def get_student_by_id(student_id):
+def _get_student_by_id(cursor, student_id):
+    """Looks up one student on an already open cursor."""
+    cursor.execute(_SQL_GET_STUDENT_BY_ID, {'student_id': student_id})
+    return cursor.fetchone()
+
+def get_student_by_id(student_id, cursor=None):
     """
     Retrieves a single student's details from the database.
+    Callers looking up many students can pass one open `cursor` to reuse it
+    instead of acquiring a connection and cursor per lookup.
     """
     try:
-        with db.get_connection() as conn:
-            with conn.cursor() as cursor:
-                query = "SELECT student_id, name, email, course, year FROM STUDENTS WHERE student_id = :student_id"
-                cursor.execute(query, {'student_id': student_id})
-                return cursor.fetchone()
-    except Exception as e:
-        print(f"Error fetching student: {e}")
+        if cursor is not None:
+            return _get_student_by_id(cursor, student_id)
+        with db.cursor() as cursor:
+            return _get_student_by_id(cursor, student_id)
+    except Exception:
+        log.exception("Error fetching student %s", student_id)
         return None
 
-def update_student(current_user_role, student_id, name, email, course, year):
+def update_student(current_user_role, student_id, name, email, course, year, connection=None):
     """
     Updates a student's details in the database.
+    If `connection` is given the update is left uncommitted (see commit_students).
     """
     if current_user_role != 'admin':
         return "Error: Administrative privileges required."
 
-    if not all([student_id, name, email]):
-        return "Error: Student ID, Name, and Email are required."
-
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        return "Error: Invalid email format."
-        
-    try:
-        year_int = int(year)
-        if year_int <= 0:
-            return "Error: Year must be a positive number."
-    except (ValueError, TypeError):
-        return "Error: Year must be a valid number."
+    error, year_int = _validate_student_fields(student_id, name, email, year)
+    if error:
+        return error
 
     try:
-        with db.get_connection() as conn:
+        with _student_connection(connection) as conn:
             with conn.cursor() as cursor:
-                query = """
-                UPDATE STUDENTS
-                SET name = :name, email = :email, course = :course, year = :year
-                WHERE student_id = :student_id
-                """
-                cursor.execute(query, {
+                cursor.execute(_SQL_UPDATE_STUDENT, {
                     'name': name,
                     'email': email,
                     'course': course,
                     'year': year_int,
                     'student_id': student_id
                 })
-                conn.commit()
+                if connection is None:
+                    conn.commit()
                 if cursor.rowcount == 0:
                     return "Error: Student not found."
                 return "Success: Student updated successfully."
     except oracledb.IntegrityError as e:
         error_obj, = e.args
-        if "UK_STUDENT_EMAIL" in error_obj.message:
-            return f"Error: A student with the email '{email}' already exists."
-        else:
-            return f"A database integrity error occurred: {e}"
+        message = _unique_violation_message(error_obj.message, student_id, email)
+        return message or f"A database integrity error occurred: {e}"
     except oracledb.DatabaseError as e:
         return f"A database error occurred: {e}"
     except Exception as e:
         return f"An unexpected error occurred: {e}"
 
-def delete_student(current_user_role, student_id):
+def update_student_returning(current_user_role, student_id, name, email, course, year):
     """
-    Deletes a student from the database.
+    Updates a student's details like update_student, but also returns the
+    stored row so callers can refresh their view without a get_student_by_id
+    round-trip. Returns (message, student_row); student_row is None on failure.
     """
     if current_user_role != 'admin':
-        return "Error: Administrative privileges required."
+        return "Error: Administrative privileges required.", None
+
+    error, year_int = _validate_student_fields(student_id, name, email, year)
+    if error:
+        return error, None
 
     try:
         with db.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = "DELETE FROM STUDENTS WHERE student_id = :student_id"
-                cursor.execute(query, {'student_id': student_id})
+                out_vars = {
+                    'out_student_id': cursor.var(str),
+                    'out_name': cursor.var(str),
+                    'out_email': cursor.var(str),
+                    'out_course': cursor.var(str),
+                    'out_year': cursor.var(int)
+                }
+                cursor.execute(_SQL_UPDATE_STUDENT_RETURNING, dict(out_vars,
+                    name=name,
+                    email=email,
+                    course=course,
+                    year=year_int,
+                    student_id=student_id
+                ))
+                if cursor.rowcount == 0:
+                    return "Error: Student not found.", None
                 conn.commit()
+                student_row = tuple(var.getvalue()[0] for var in out_vars.values())
+                return "Success: Student updated successfully.", student_row
+    except oracledb.IntegrityError as e:
+        error_obj, = e.args
+        message = _unique_violation_message(error_obj.message, student_id, email)
+        return message or f"A database integrity error occurred: {e}", None
+    except oracledb.DatabaseError as e:
+        return f"A database error occurred: {e}", None
+    except Exception as e:
+        return f"An unexpected error occurred: {e}", None
+
+def delete_student(current_user_role, student_id, connection=None):
+    """
+    Deletes a student from the database.
+    If `connection` is given the delete is left uncommitted (see commit_students).
+    """
+    if current_user_role != 'admin':
+        return "Error: Administrative privileges required."
+
+    try:
+        with _student_connection(connection) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(_SQL_DELETE_STUDENT, {'student_id': student_id})
+                if connection is None:
+                    conn.commit()
                 if cursor.rowcount == 0:
                     return "Error: Student not found."
                 return "Success: Student deleted successfully."
@@ -185,6 +348,7 @@ if __name__ == '__main__':
         print("Test passed: Volunteer was correctly prevented from adding a student.")
 
     # Execute the tests
+    logging.basicConfig(level=logging.INFO)
     db.init_pool()
     test_admin_can_add_student()
     test_volunteer_cannot_add_student()
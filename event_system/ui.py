@@ -1,16 +1,271 @@
+import bisect
+import collections
+import contextlib
+import datetime
+import re
+import threading
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
-from ttkthemes import ThemedTk
-from . import auth, events, registrations, attendance, reports, email_utils, students, db, config
-import datetime
-import os
+from . import auth, events, registrations, attendance, students, db, config
+# email_utils and reports are imported where first used, so startup and the
+# login screen don't pay for them
+
+try:
+    from ttkthemes import ThemedTk as _BaseTk
+    _BASE_TK_OPTIONS = {'theme': config.DESKTOP_THEME}
+except ImportError:
+    # Fall back to the stock ttk look when ttkthemes isn't installed
+    _BaseTk = tk.Tk
+    _BASE_TK_OPTIONS = {}
+
+# Lists shorter than this are searched by a plain scan; longer ones get a trigram index
+TRIGRAM_INDEX_MIN_ROWS = 500
+
+# Rows added to a student list at a time; more are added while scrolling
+STUDENT_PAGE_SIZE = 200
+
+# Delay before a search box filter runs, so a burst of keystrokes causes one
+# Treeview rebuild instead of one per key
+FILTER_DEBOUNCE_MS = 150
+
+# --- Fonts ---
+# Shared font tuples, so every widget passes the same objects to Tk
+FONT_BODY = ("Helvetica", 13)
+FONT_FRAME_LABEL = ("Helvetica", 15, "bold")
+FONT_HEADER = ("Helvetica", 19, "bold")
+FONT_ROLE = ("Arial", 14)
+FONT_INPUT = ("Arial", 12)
+
+_styles_configured = False
+
+def _configure_styles(style):
+    """Applies the app's ttk styles once per process."""
+    global _styles_configured
+    if _styles_configured:
+        return
+    style.configure("TLabel", font=FONT_BODY)
+    style.configure("TButton", font=FONT_BODY, padding=10)
+    style.configure("TEntry", font=FONT_BODY, padding=5)
+    style.configure("TLabelFrame.Label", font=FONT_FRAME_LABEL)
+    style.configure("Header.TLabel", font=FONT_HEADER)
+    _styles_configured = True
+
+# Format checks for the event form, compiled once. The time pattern accepts
+# exactly what strptime(..., '%I:%M %p') does, e.g. "10:5 AM" or "9:05  pm".
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIME_RE = re.compile(r"(1[0-2]|0?[1-9]):([0-5]\d|\d)\s+(AM|PM)", re.IGNORECASE)
+
+# Characters that must be backslash-escaped for a value to stay one Tcl word
+_TCL_SPECIAL_RE = re.compile(r'([\\{}\[\]$"; \t])')
+
+def tk_quote(value):
+    """Quotes a value as a single word of a Tcl script."""
+    text = str(value)
+    if not text:
+        return '{}'
+    return _TCL_SPECIAL_RE.sub(r'\\\1', text).replace('\n', '\\n').replace('\r', '\\r')
+
+def insert_rows(tree, rows, iids=None):
+    """
+    Appends many rows to a Treeview with a single Tcl eval instead of one
+    tree.insert() call (and Python/Tcl crossing) per row. `iids`, if given,
+    supplies the item id for each row.
+    """
+    if not rows:
+        return
+    path = str(tree)
+    if iids is None:
+        lines = (f"{path} insert {{}} end -values [list {' '.join(map(tk_quote, values))}]"
+                 for values in rows)
+    else:
+        lines = (f"{path} insert {{}} end -id {tk_quote(iid)} -values [list {' '.join(map(tk_quote, values))}]"
+                 for iid, values in zip(iids, rows))
+    tree.tk.eval("\n".join(lines))
+
+def build_trigram_index(name_index):
+    """
+    Maps every 3-character substring of the names in `name_index` (a list of
+    (iid, lower-cased name)) to the set of positions whose name contains it.
+    Returns None for lists too short for the index to pay off.
+    """
+    if len(name_index) < TRIGRAM_INDEX_MIN_ROWS:
+        return None
+    trigrams = collections.defaultdict(set)
+    for pos, (iid, name_lc) in enumerate(name_index):
+        for i in range(len(name_lc) - 2):
+            trigrams[name_lc[i:i + 3]].add(pos)
+    return trigrams
+
+def search_names(name_index, trigrams, term):
+    """
+    Returns the iids from `name_index` whose name contains `term` (already
+    lower-cased), in list order. With a trigram index and a term of 3+
+    characters only rows sharing all of the term's trigrams are checked.
+    """
+    if trigrams is None or len(term) < 3:
+        return tuple(iid for iid, name_lc in name_index if term in name_lc)
 
-class EventSystemUI(ThemedTk):
+    postings = sorted((trigrams.get(term[i:i + 3], ()) for i in range(len(term) - 2)), key=len)
+    candidates = set(postings[0]).intersection(*postings[1:])
+    return tuple(name_index[pos][0] for pos in sorted(candidates) if term in name_index[pos][1])
+
+@contextlib.contextmanager
+def scroll_frozen(tree):
+    """
+    Detaches the tree's yscrollcommand while rows are added or reordered, so
+    the scrollbar is updated once afterwards rather than on every change.
+    """
+    yscrollcommand = tree.cget('yscrollcommand')
+    tree.configure(yscrollcommand="")
+    try:
+        yield tree
+    finally:
+        # The next redraw reports the final position through the restored command
+        tree.configure(yscrollcommand=yscrollcommand)
+
+def add_field(frame, row, label, width=None, padx=5):
+    """Adds a Label + Entry pair on `row` of a two-column form grid and returns the Entry."""
+    ttk.Label(frame, text=label).grid(row=row, column=0, sticky="w", pady=5, padx=padx)
+    entry = ttk.Entry(frame, width=width) if width else ttk.Entry(frame)
+    entry.grid(row=row, column=1, sticky="ew", pady=5, padx=padx)
+    return entry
+
+# --- Form Fields ---
+# (label, attribute name, entry width) for each add_field row, top to bottom
+_STUDENT_FIELDS = (
+    ("Student ID:", "student_id_entry", 40),
+    ("Name:", "name_entry", None),
+    ("Email:", "email_entry", None),
+    ("Course:", "course_entry", None),
+    ("Year:", "year_entry", None),
+)
+_EDIT_STUDENT_FIELDS = _STUDENT_FIELDS[1:]
+_EVENT_FIELDS = (
+    ("Event Name:", "event_name_entry", 40),
+    ("Date (YYYY-MM-DD):", "event_date_entry", None),
+    ("Time (HH:MM AM/PM):", "event_time_entry", None),
+    ("Venue:", "venue_entry", None),
+    ("Total Slots:", "total_slots_entry", None),
+)
+
+def _setup_tree(tree, spec):
+    """
+    Sets the heading text and width of each Treeview column with one Tcl eval.
+    `spec` is a sequence of (column_id, heading_text, width).
+    """
+    path = str(tree)
+    script = "\n".join(
+        f"{path} heading {tk_quote(column)} -text {tk_quote(text)}\n"
+        f"{path} column {tk_quote(column)} -width {int(width)}"
+        for column, text, width in spec
+    )
+    tree.tk.eval(script)
+
+def fetch_in_background(widget, fetch, apply):
+    """
+    Runs the blocking `fetch` (usually a DB query) on a worker thread and hands
+    its result to `apply` on the Tk thread via after(), so the window keeps
+    responding meanwhile. The result is dropped if the widget was destroyed.
+    """
+    def deliver(result):
+        if widget.winfo_exists():
+            apply(result)
+
+    def worker():
+        result = fetch()
+        try:
+            widget.after(0, deliver, result)
+        except (RuntimeError, tk.TclError):
+            pass  # The application was closed while fetching
+
+    threading.Thread(target=worker, daemon=True).start()
+
+class PagedListMixin:
+    """
+    Shows a searchable student list in self.tree a page at a time: tree items
+    are only created once they scroll into view, and rows filtered out by the
+    search box are detached rather than deleted. Items use the row's first
+    value (the student ID) as their iid and the second (the name) is searched.
+
+    Screens call _init_paged_list() first, then create self.search_entry
+    (bound to filter_students), self.tree and self.scrollbar with the tree's
+    yscrollcommand set to _on_tree_scroll, and pass each load to _set_rows().
+    """
+
+    def _init_paged_list(self):
+        self._filter_after_id = None
+        self._row_values = {}  # iid -> values for every loaded row, in list order
+        self._tree_rows = {}  # iid -> values of the items created in the tree
+        self._name_index = []  # (iid, lower-cased name) in list order
+        self._trigrams = None  # build_trigram_index(self._name_index)
+        self._matches = ()  # iids passing the current search, in list order
+        self._visible_count = STUDENT_PAGE_SIZE
+
+    def _set_rows(self, rows, reset_page=False):
+        """
+        Replaces the list with `rows` (value tuples). Only items that were
+        removed or changed since the last load are touched in the tree.
+        """
+        self._row_values = {str(values[0]): tuple(values) for values in rows}
+        stale_iids = [iid for iid in self._tree_rows if iid not in self._row_values]
+        if stale_iids:
+            self.tree.delete(*stale_iids)
+            for iid in stale_iids:
+                del self._tree_rows[iid]
+
+        for iid, values in self._tree_rows.items():
+            if self._row_values[iid] != values:
+                self.tree.item(iid, values=self._row_values[iid])
+                self._tree_rows[iid] = self._row_values[iid]
+        # Search index built once per load, so filtering does no per-key lower()
+        self._name_index = [(iid, values[1].lower()) for iid, values in self._row_values.items()]
+        self._trigrams = build_trigram_index(self._name_index)
+        self._do_filter(reset_page)
+
+    def filter_students(self, event):
+        # Restart the timer on every key; only the last one in a burst filters
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(FILTER_DEBOUNCE_MS, self._do_filter)
+
+    def _do_filter(self, reset_page=True):
+        # A new search starts again at the first page; a data refresh keeps
+        # what was already scrolled into view.
+        self._filter_after_id = None
+        filter_term = self.search_entry.get().lower()
+        self._matches = search_names(self._name_index, self._trigrams, filter_term)
+        if reset_page:
+            self._visible_count = STUDENT_PAGE_SIZE
+        self._show_page()
+
+    def _show_page(self):
+        """Shows the first _visible_count matching rows, creating any not yet in the tree."""
+        visible = self._matches[:self._visible_count]
+        missing = [iid for iid in visible if iid not in self._tree_rows]
+        with scroll_frozen(self.tree):
+            if missing:
+                rows = [self._row_values[iid] for iid in missing]
+                insert_rows(self.tree, rows, iids=missing)
+                self._tree_rows.update(zip(missing, rows))
+
+            # set_children detaches rows missing from `visible` and reattaches the
+            # rest in order, in one Tcl call; skipped when nothing changed
+            if self.tree.get_children() != visible:
+                self.tree.set_children("", *visible)
+
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Near the bottom: add the next page of matches
+        if float(last) > 0.9 and self._visible_count < len(self._matches):
+            self._visible_count += STUDENT_PAGE_SIZE
+            self.after_idle(self._show_page)
+
+class EventSystemUI(_BaseTk):
     """
     Main application window that manages different frames (screens).
     """
     def __init__(self):
-        super().__init__(theme=config.DESKTOP_THEME)
+        super().__init__(**_BASE_TK_OPTIONS)
 
         # --- Database Pool Management ---
         try:
@@ -28,11 +283,7 @@ class EventSystemUI(ThemedTk):
 
         # --- Style Configuration ---
         self.style = ttk.Style()
-        self.style.configure("TLabel", font=("Helvetica", 13))
-        self.style.configure("TButton", font=("Helvetica", 13), padding=10)
-        self.style.configure("TEntry", font=("Helvetica", 13), padding=5)
-        self.style.configure("TLabelFrame.Label", font=("Helvetica", 15, "bold"))
-        self.style.configure("Header.TLabel", font=("Helvetica", 19, "bold"))
+        _configure_styles(self.style)
 
         # Container for all frames
         self.container = ttk.Frame(self)
@@ -41,6 +292,10 @@ class EventSystemUI(ThemedTk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.current_user = None
+        self._frames = {}  # FrameClass -> frame kept for the current user
+        self._current_frame = None
+        # One <Return> binding for the whole app, forwarded to the shown frame
+        self.bind('<Return>', self._on_return)
         self.show_login_screen()
 
     def on_closing(self):
@@ -52,18 +307,43 @@ class EventSystemUI(ThemedTk):
         self.destroy()
 
     def show_frame(self, FrameClass):
-        """Destroys the current frame and shows the new one."""
+        """
+        Hides the current frame and shows the requested one. Frames are built
+        once per login and kept; a reused frame gets refresh() so it reloads
+        its data instead of rebuilding all of its widgets.
+        """
         for widget in self.container.winfo_children():
-            widget.destroy()
-        frame = FrameClass(self.container, self, user=self.current_user)
+            widget.grid_remove()
+        frame = self._frames.get(FrameClass)
+        if frame is None:
+            frame = FrameClass(self.container, self, user=self.current_user)
+            self._frames[FrameClass] = frame
+        elif hasattr(frame, 'refresh'):
+            frame.refresh(self.current_user)
         frame.grid(row=0, column=0, sticky="nsew")
+        self._current_frame = frame
+
+    def _on_return(self, event):
+        """Lets the shown frame handle the Return key if it has an on_enter()."""
+        on_enter = getattr(self._current_frame, 'on_enter', None)
+        if on_enter:
+            on_enter()
+
+    def _reset_frames(self):
+        """Destroys all kept frames, e.g. when the logged-in user changes."""
+        for widget in self.container.winfo_children():
+            widget.destroy()
+        self._frames = {}
 
     def show_login_screen(self):
         self.current_user = None
+        self._reset_frames()
         self.show_frame(LoginScreen)
 
     def show_dashboard(self, user_data):
         """Shows the dashboard after a successful login."""
+        if user_data is not self.current_user:
+            self._reset_frames()
         self.current_user = user_data
         self.show_frame(DashboardScreen)
     def show_volunteer_registration_screen(self):
@@ -108,10 +388,12 @@ class LoginScreen(ttk.Frame):
         register_button = ttk.Button(form_frame, text="Register as Volunteer", command=self.controller.show_volunteer_registration_screen)
         register_button.grid(row=4, column=0, columnspan=2, pady=10)
 
-        self.message_label = ttk.Label(form_frame, text="", foreground="red")
+        self.message_var = tk.StringVar()
+        self.message_label = ttk.Label(form_frame, textvariable=self.message_var, foreground="red")
         self.message_label.grid(row=5, column=0, columnspan=2, pady=5)
         
-        self.controller.bind('<Return>', lambda event: self.handle_login())
+    def on_enter(self):
+        self.handle_login()
 
     def handle_login(self):
         """
@@ -121,16 +403,15 @@ class LoginScreen(ttk.Frame):
         password = self.password_entry.get()
 
         if not username or not password:
-            self.message_label.config(text="Username and password are required.")
+            self.message_var.set("Username and password are required.")
             return
 
         user_data = auth.login(username, password)
 
         if user_data:
-            self.controller.unbind('<Return>')
             self.controller.show_dashboard(user_data)
         else:
-            self.message_label.config(text="Invalid username or password.")
+            self.message_var.set("Invalid username or password.")
 
 class VolunteerRegistrationScreen(ttk.Frame):
     """
@@ -171,10 +452,12 @@ class VolunteerRegistrationScreen(ttk.Frame):
         back_button = ttk.Button(form_frame, text="Back to Login", command=self.controller.show_login_screen)
         back_button.grid(row=4, column=0, columnspan=2, pady=10)
 
-        self.message_label = ttk.Label(form_frame, text="", foreground="red")
+        self.message_var = tk.StringVar()
+        self.message_label = ttk.Label(form_frame, textvariable=self.message_var, foreground="red")
         self.message_label.grid(row=5, column=0, columnspan=2, pady=5)
         
-        self.controller.bind('<Return>', lambda event: self.handle_registration())
+    def on_enter(self):
+        self.handle_registration()
 
     def handle_registration(self):
         """
@@ -184,7 +467,7 @@ class VolunteerRegistrationScreen(ttk.Frame):
         password = self.password_entry.get()
 
         if not username or not password:
-            self.message_label.config(text="Username and password are required.")
+            self.message_var.set("Username and password are required.")
             return
 
         result = auth.create_web_user(username, password)
@@ -193,7 +476,7 @@ class VolunteerRegistrationScreen(ttk.Frame):
             messagebox.showinfo("Success", result)
             self.controller.show_login_screen()
         else:
-            self.message_label.config(text=result)
+            self.message_var.set(result)
 
 class DashboardScreen(ttk.Frame):
     """
@@ -217,7 +500,7 @@ class DashboardScreen(ttk.Frame):
         header_frame.grid(row=0, column=0, pady=(20, 10))
 
         ttk.Label(header_frame, text=f"Welcome, {self.user['username']}!", style="Header.TLabel").pack()
-        ttk.Label(header_frame, text=f"Your Role: {self.user['role'].capitalize()}", font=("Arial", 14)).pack()
+        ttk.Label(header_frame, text=f"Your Role: {self.user['role'].capitalize()}", font=FONT_ROLE).pack()
 
         # Button frame
         button_frame = ttk.Frame(self)
@@ -249,7 +532,7 @@ class DashboardScreen(ttk.Frame):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
             self.controller.show_login_screen()
 
-class StudentManagementScreen(ttk.Frame):
+class StudentManagementScreen(PagedListMixin, ttk.Frame):
     """
     Screen for creating and viewing students.
     """
@@ -263,25 +546,8 @@ class StudentManagementScreen(ttk.Frame):
         form_frame = ttk.LabelFrame(self, text="Add New Student")
         form_frame.pack(pady=10, padx=10, fill="x")
 
-        ttk.Label(form_frame, text="Student ID:").grid(row=0, column=0, sticky="w", pady=5, padx=5)
-        self.student_id_entry = ttk.Entry(form_frame, width=40)
-        self.student_id_entry.grid(row=0, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Name:").grid(row=1, column=0, sticky="w", pady=5, padx=5)
-        self.name_entry = ttk.Entry(form_frame)
-        self.name_entry.grid(row=1, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Email:").grid(row=2, column=0, sticky="w", pady=5, padx=5)
-        self.email_entry = ttk.Entry(form_frame)
-        self.email_entry.grid(row=2, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Course:").grid(row=3, column=0, sticky="w", pady=5, padx=5)
-        self.course_entry = ttk.Entry(form_frame)
-        self.course_entry.grid(row=3, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Year:").grid(row=4, column=0, sticky="w", pady=5, padx=5)
-        self.year_entry = ttk.Entry(form_frame)
-        self.year_entry.grid(row=4, column=1, sticky="ew", pady=5, padx=5)
+        for row, (label, attr, width) in enumerate(_STUDENT_FIELDS):
+            setattr(self, attr, add_field(form_frame, row, label, width))
         
         create_button = ttk.Button(form_frame, text="Add Student", command=self.handle_add_student, style="Accent.TButton")
         create_button.grid(row=5, column=0, columnspan=2, pady=10)
@@ -296,25 +562,23 @@ class StudentManagementScreen(ttk.Frame):
         self.search_entry = ttk.Entry(search_frame)
         self.search_entry.pack(fill="x", expand=True, side="left")
         self.search_entry.bind("<KeyRelease>", self.filter_students)
+        self.all_students = []
+        self._init_paged_list()
 
         self.tree = ttk.Treeview(list_frame, columns=("ID", "Name", "Email", "Course", "Year"), show='headings')
-        self.tree.heading("ID", text="Student ID")
-        self.tree.heading("Name", text="Name")
-        self.tree.heading("Email", text="Email")
-        self.tree.heading("Course", text="Course")
-        self.tree.heading("Year", text="Year")
-
-        self.tree.column("ID", width=100)
-        self.tree.column("Name", width=150)
-        self.tree.column("Email", width=200)
-        self.tree.column("Course", width=100)
-        self.tree.column("Year", width=50)
+        _setup_tree(self.tree, (
+            ("ID", "Student ID", 100),
+            ("Name", "Name", 150),
+            ("Email", "Email", 200),
+            ("Course", "Course", 100),
+            ("Year", "Year", 50),
+        ))
 
         self.tree.pack(fill="both", expand=True, side="left")
         
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
 
         button_frame = ttk.Frame(self)
         button_frame.pack(pady=10)
@@ -362,8 +626,7 @@ class StudentManagementScreen(ttk.Frame):
             messagebox.showerror("Selection Error", "Please select a student to edit.")
             return
 
-        student_details = self.tree.item(selected_item)
-        student_id = student_details['values'][0]
+        student_id = selected_item  # rows use the student ID as their iid
         
         edit_window = EditStudentWindow(self, self.controller, self.user, student_id)
         edit_window.grab_set()
@@ -374,8 +637,7 @@ class StudentManagementScreen(ttk.Frame):
             messagebox.showerror("Selection Error", "Please select a student to delete.")
             return
 
-        student_details = self.tree.item(selected_item)
-        student_id = student_details['values'][0]
+        student_id = selected_item  # rows use the student ID as their iid
 
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete student {student_id}?"):
             result = students.delete_student(self.user['role'], student_id)
@@ -385,20 +647,18 @@ class StudentManagementScreen(ttk.Frame):
             else:
                 messagebox.showerror("Error", result)
 
-    def populate_students_list(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.all_students = students.get_all_students()
-        for student in self.all_students:
-            self.tree.insert("", "end", values=student)
+    def refresh(self, user):
+        self.user = user
+        self.populate_students_list()
 
-    def filter_students(self, event):
-        filter_term = self.search_entry.get().lower()
-        self.tree.delete(*self.tree.get_children())
+    def populate_students_list(self):
+        fetch_in_background(self, students.get_all_students, self._apply_students)
 
-        for student in self.all_students:
-            if filter_term in student[1].lower():
-                self.tree.insert("", "end", values=student)
+    def _apply_students(self, all_students):
+        # Rows use the student ID as their iid, so a refresh only touches the
+        # rows that were added, removed or changed since the last one.
+        self.all_students = all_students
+        self._set_rows(self.all_students)
 
     def clear_form(self):
         self.student_id_entry.delete(0, 'end')
@@ -427,25 +687,11 @@ class EditStudentWindow(tk.Toplevel):
         form_frame = ttk.Frame(self, padding=10)
         form_frame.pack(fill="both", expand=True)
 
-        ttk.Label(form_frame, text="Name:").grid(row=0, column=0, sticky="w", pady=5)
-        self.name_entry = ttk.Entry(form_frame)
-        self.name_entry.grid(row=0, column=1, sticky="ew", pady=5)
-        self.name_entry.insert(0, student_data[1])
-
-        ttk.Label(form_frame, text="Email:").grid(row=1, column=0, sticky="w", pady=5)
-        self.email_entry = ttk.Entry(form_frame)
-        self.email_entry.grid(row=1, column=1, sticky="ew", pady=5)
-        self.email_entry.insert(0, student_data[2])
-
-        ttk.Label(form_frame, text="Course:").grid(row=2, column=0, sticky="w", pady=5)
-        self.course_entry = ttk.Entry(form_frame)
-        self.course_entry.grid(row=2, column=1, sticky="ew", pady=5)
-        self.course_entry.insert(0, student_data[3])
-
-        ttk.Label(form_frame, text="Year:").grid(row=3, column=0, sticky="w", pady=5)
-        self.year_entry = ttk.Entry(form_frame)
-        self.year_entry.grid(row=3, column=1, sticky="ew", pady=5)
-        self.year_entry.insert(0, student_data[4])
+        # Fields are pre-filled from student_data, skipping the (read-only) ID
+        for row, ((label, attr, width), value) in enumerate(zip(_EDIT_STUDENT_FIELDS, student_data[1:])):
+            entry = add_field(form_frame, row, label, width=None, padx=0)
+            entry.insert(0, value)
+            setattr(self, attr, entry)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(pady=10)
@@ -490,25 +736,8 @@ class EventManagementScreen(ttk.Frame):
         form_frame = ttk.LabelFrame(self, text="Create New Event")
         form_frame.pack(pady=10, padx=10, fill="x")
 
-        ttk.Label(form_frame, text="Event Name:").grid(row=0, column=0, sticky="w", pady=5, padx=5)
-        self.event_name_entry = ttk.Entry(form_frame, width=40)
-        self.event_name_entry.grid(row=0, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Date (YYYY-MM-DD):").grid(row=1, column=0, sticky="w", pady=5, padx=5)
-        self.event_date_entry = ttk.Entry(form_frame)
-        self.event_date_entry.grid(row=1, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Time (HH:MM AM/PM):").grid(row=2, column=0, sticky="w", pady=5, padx=5)
-        self.event_time_entry = ttk.Entry(form_frame)
-        self.event_time_entry.grid(row=2, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Venue:").grid(row=3, column=0, sticky="w", pady=5, padx=5)
-        self.venue_entry = ttk.Entry(form_frame)
-        self.venue_entry.grid(row=3, column=1, sticky="ew", pady=5, padx=5)
-
-        ttk.Label(form_frame, text="Total Slots:").grid(row=4, column=0, sticky="w", pady=5, padx=5)
-        self.total_slots_entry = ttk.Entry(form_frame)
-        self.total_slots_entry.grid(row=4, column=1, sticky="ew", pady=5, padx=5)
+        for row, (label, attr, width) in enumerate(_EVENT_FIELDS):
+            setattr(self, attr, add_field(form_frame, row, label, width))
         
         create_button = ttk.Button(form_frame, text="Create Event", command=self.handle_create_event, style="Accent.TButton")
         create_button.grid(row=5, column=0, columnspan=2, pady=10)
@@ -517,19 +746,14 @@ class EventManagementScreen(ttk.Frame):
         list_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
         self.tree = ttk.Treeview(list_frame, columns=("ID", "Name", "Date", "Time", "Venue", "Slots"), show='headings')
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Name", text="Event Name")
-        self.tree.heading("Date", text="Date")
-        self.tree.heading("Time", text="Time")
-        self.tree.heading("Venue", text="Venue")
-        self.tree.heading("Slots", text="Total Slots")
-
-        self.tree.column("ID", width=50)
-        self.tree.column("Name", width=200)
-        self.tree.column("Date", width=100)
-        self.tree.column("Time", width=80)
-        self.tree.column("Venue", width=150)
-        self.tree.column("Slots", width=80)
+        _setup_tree(self.tree, (
+            ("ID", "ID", 50),
+            ("Name", "Event Name", 200),
+            ("Date", "Date", 100),
+            ("Time", "Time", 80),
+            ("Venue", "Venue", 150),
+            ("Slots", "Total Slots", 80),
+        ))
 
         self.tree.pack(fill="both", expand=True, side="left")
         
@@ -555,15 +779,17 @@ class EventManagementScreen(ttk.Frame):
         venue = self.venue_entry.get()
         slots_str = self.total_slots_entry.get()
 
+        # The regex rejects malformed input cheaply; strptime still catches
+        # impossible dates such as 2024-02-30
         try:
+            if not _DATE_RE.match(date_str):
+                raise ValueError
             event_date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             messagebox.showerror("Input Error", "Invalid date format. Please use YYYY-MM-DD.")
             return
 
-        try:
-            datetime.datetime.strptime(time_str, "%I:%M %p")
-        except ValueError:
+        if not _TIME_RE.fullmatch(time_str):
             messagebox.showerror("Input Error", "Invalid time format. Please use HH:MM AM/PM.")
             return
 
@@ -582,14 +808,22 @@ class EventManagementScreen(ttk.Frame):
         else:
             messagebox.showerror("Error", result)
 
+    def refresh(self, user):
+        self.user = user
+        self.populate_events_list()
+
     def populate_events_list(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        all_events = events.get_all_events()
+        fetch_in_background(self, events.get_all_events, self._apply_events)
+
+    def _apply_events(self, all_events):
+        rows = []
         for event in all_events:
             event_id, name, date, time, venue, slots = event
-            formatted_date = date.strftime("%Y-%m-%d")
-            self.tree.insert("", "end", values=(event_id, name, formatted_date, time, venue, slots))
+            formatted_date = date.date().isoformat()  # Oracle DATE columns arrive as datetime
+            rows.append((event_id, name, formatted_date, time, venue, slots))
+        with scroll_frozen(self.tree):
+            self.tree.delete(*self.tree.get_children())
+            insert_rows(self.tree, rows)
 
     def clear_form(self):
         self.event_name_entry.delete(0, 'end')
@@ -613,7 +847,7 @@ class EmailNotificationScreen(ttk.Frame):
         event_frame.pack(pady=10, padx=10, fill="x")
 
         ttk.Label(event_frame, text="Choose Event:").pack(side="left", padx=5)
-        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=("Arial", 12))
+        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=FONT_INPUT)
         self.event_menu.pack(side="left", padx=5)
         self.event_menu.bind("<<ComboboxSelected>>", self.handle_event_selection)
         
@@ -622,7 +856,7 @@ class EmailNotificationScreen(ttk.Frame):
         message_frame = ttk.LabelFrame(self, text="Custom Message (Optional)")
         message_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
-        self.message_text = tk.Text(message_frame, height=10, width=70, font=("Arial", 12))
+        self.message_text = tk.Text(message_frame, height=10, width=70, font=FONT_INPUT)
         self.message_text.pack(pady=5, padx=5, fill="both", expand=True)
         
         action_frame = ttk.Frame(self)
@@ -637,14 +871,24 @@ class EmailNotificationScreen(ttk.Frame):
         back_button = ttk.Button(action_frame, text="Back to Dashboard", command=lambda: controller.show_dashboard(self.user))
         back_button.pack(side="left", padx=10)
 
+    def refresh(self, user):
+        self.user = user
+        self.populate_event_dropdown()
+
     def populate_event_dropdown(self):
-        all_events = events.get_all_events()
-        self.event_map = {f"{event[0]}: {event[1]}": event[0] for event in all_events}
-        self.event_menu['values'] = list(self.event_map.keys())
+        fetch_in_background(self, events.get_dropdown_choices, self._apply_event_dropdown)
+
+    def _apply_event_dropdown(self, choices):
+        labels, self.event_map = choices
+        self.event_menu['values'] = labels
 
     def handle_event_selection(self, event_arg):
         pass
 
+    def _email_completion_callback_threadsafe(self, results):
+        # Called on the email thread; show the result from the Tk thread
+        self.after(0, self._email_completion_callback, results)
+
     def _email_completion_callback(self, results):
         success_count = results.get('success_count', 0)
         fail_count = results.get('fail_count', 0)
@@ -654,6 +898,7 @@ class EmailNotificationScreen(ttk.Frame):
                             f"Failed to send: {fail_count}")
 
     def handle_send_emails(self):
+        from . import email_utils
         selection = self.selected_event_id.get()
         if not selection:
             messagebox.showerror("Error", "Please select an event.")
@@ -671,14 +916,9 @@ class EmailNotificationScreen(ttk.Frame):
         
         _, event_name, event_date, event_time, venue, _ = event_details
         
-        registered_students_data = registrations.get_registered_students(event_id)
-        if not registered_students_data:
-            messagebox.showwarning("No Recipients", "No students are registered for this event.")
-            return
-
-        recipients = [student[2] for student in registered_students_data if student[2]]
+        recipients = registrations.get_recipient_emails(event_id)
         if not recipients:
-            messagebox.showwarning("No Recipients", "No valid email addresses found for registered students.")
+            messagebox.showwarning("No Recipients", "No students are registered for this event.")
             return
 
         custom_message = self.message_text.get("1.0", tk.END).strip()
@@ -698,9 +938,10 @@ class EmailNotificationScreen(ttk.Frame):
             return
 
         messagebox.showinfo("Sending Emails", "Emails are being sent in the background. You will be notified upon completion.")
-        email_utils.send_emails_in_background(recipients, email_subject, email_body, self._email_completion_callback)
+        email_utils.send_emails_in_background(recipients, email_subject, email_body, self._email_completion_callback_threadsafe)
 
     def handle_send_test_email(self):
+        from . import email_utils
         current_user_email = email_utils.EMAIL_CONFIG.get("sender_email")
         if not current_user_email or current_user_email == "your_email@example.com":
             messagebox.showerror("Configuration Error", "Please configure 'sender_email' in config.py for testing.")
@@ -733,16 +974,18 @@ class EmailNotificationScreen(ttk.Frame):
         email_subject = f"TEST: Notification: {event_name}"
 
         messagebox.showinfo("Sending Test Email", "Sending a test email in the background.")
-        email_utils.send_emails_in_background([current_user_email], email_subject, email_body, self._email_completion_callback)
+        email_utils.send_emails_in_background([current_user_email], email_subject, email_body, self._email_completion_callback_threadsafe)
 
 
-class RegistrationScreen(ttk.Frame):
+class RegistrationScreen(PagedListMixin, ttk.Frame):
     def __init__(self, parent, controller, user=None):
         super().__init__(parent)
         self.controller = controller
         self.user = user
         self.selected_event_id = tk.StringVar()
         self.event_map = {}
+        self.students = []
+        self._init_paged_list()
 
         ttk.Label(self, text="Student Registration", style="Header.TLabel").pack(pady=10)
 
@@ -750,7 +993,7 @@ class RegistrationScreen(ttk.Frame):
         event_frame.pack(pady=10, padx=10, fill="x")
 
         ttk.Label(event_frame, text="Choose Event:").pack(side="left", padx=5)
-        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=("Arial", 12))
+        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=FONT_INPUT)
         self.event_menu.pack(side="left", padx=5)
         self.event_menu.bind("<<ComboboxSelected>>", self.handle_event_selection)
         
@@ -786,47 +1029,60 @@ class RegistrationScreen(ttk.Frame):
         self.tree.heading("Reg Date", text="Registration Date")
         self.tree.pack(fill="both", expand=True, side="left")
         
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
         
         back_button = ttk.Button(self, text="Back to Dashboard", command=lambda: controller.show_dashboard(self.user))
         back_button.pack(pady=20)
 
+    def refresh(self, user):
+        self.user = user
+        self.populate_event_dropdown()
+        self.populate_registered_students()
+
     def populate_event_dropdown(self):
-        all_events = events.get_all_events()
-        self.event_map = {f"{event[0]}: {event[1]}": event[0] for event in all_events}
-        self.event_menu['values'] = list(self.event_map.keys())
+        labels, self.event_map = events.get_dropdown_choices()
+        self.event_menu['values'] = labels
 
     def handle_event_selection(self, event_arg):
-        self.populate_registered_students()
+        self.populate_registered_students(reset_page=True)
 
-    def populate_registered_students(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def populate_registered_students(self, reset_page=False):
+        self.students = []
+        rows = []
 
         selection = self.selected_event_id.get()
-        if not selection:
-            return
-            
-        event_id = self.event_map.get(selection)
+        event_id = self.event_map.get(selection) if selection else None
         if event_id:
             self.students = registrations.get_registered_students(event_id)
-            for student in self.students:
-                student_id, name, email, reg_date = student
-                formatted_date = reg_date.strftime("%Y-%m-%d %H:%M")
-                self.tree.insert("", "end", values=(student_id, name, formatted_date))
-
-    def filter_students(self, event):
-        filter_term = self.search_entry.get().lower()
-        self.tree.delete(*self.tree.get_children())
-
-        for student in self.students:
-            if filter_term in student[1].lower():
-                student_id, name, email, reg_date = student
-                formatted_date = reg_date.strftime("%Y-%m-%d %H:%M")
-                self.tree.insert("", "end", values=(student_id, name, formatted_date))
-
+            rows = [self._list_row(student) for student in self.students]
+        self._set_rows(rows, reset_page)
+
+    @staticmethod
+    def _list_row(student):
+        """Returns the values shown in the list for a get_registered_students row."""
+        student_id, name, email, reg_date = student
+        formatted_date = reg_date.strftime("%Y-%m-%d %H:%M")
+        return (student_id, name, formatted_date)
+
+    def _add_registration(self, event_id, student_id):
+        """Adds a new registration to the list without reloading the whole event."""
+        student = registrations.get_student_registration(event_id, student_id)
+        if student is None or str(student[0]) in self._row_values:
+            self.populate_registered_students()
+            return
+        # Keep the list in name order, as loaded
+        pos = bisect.bisect_right([s[1] for s in self.students], student[1])
+        self.students.insert(pos, student)
+        rows = list(self._row_values.values())
+        rows.insert(pos, self._list_row(student))
+        self._set_rows(rows)
+
+    def _remove_registration(self, iid):
+        """Drops a cancelled registration from the list without reloading the event."""
+        self.students = [s for s in self.students if str(s[0]) != iid]
+        self._set_rows([values for row_iid, values in self._row_values.items() if row_iid != iid])
 
     def handle_register(self):
         student_id = self.student_id_entry.get()
@@ -846,7 +1102,7 @@ class RegistrationScreen(ttk.Frame):
         if "Success" in result:
             messagebox.showinfo("Success", result)
             self.student_id_entry.delete(0, 'end')
-            self.populate_registered_students()
+            self._add_registration(event_id, student_id)
         elif "Info" in result:
             messagebox.showinfo("Info", result)
         else:
@@ -858,8 +1114,7 @@ class RegistrationScreen(ttk.Frame):
             messagebox.showerror("Selection Error", "Please select a student from the list to cancel their registration.")
             return
 
-        student_details = self.tree.item(selected_item)
-        student_id = student_details['values'][0]
+        student_id = selected_item  # rows use the student ID as their iid
         
         selection = self.selected_event_id.get()
         event_id = self.event_map.get(selection)
@@ -872,18 +1127,20 @@ class RegistrationScreen(ttk.Frame):
 
         if "Success" in result:
             messagebox.showinfo("Success", result)
-            self.populate_registered_students()
+            self._remove_registration(selected_item)
         else:
             messagebox.showerror("Error", result)
 
 
-class AttendanceScreen(ttk.Frame):
+class AttendanceScreen(PagedListMixin, ttk.Frame):
     def __init__(self, parent, controller, user=None):
         super().__init__(parent)
         self.controller = controller
         self.user = user
         self.selected_event_id = tk.StringVar()
         self.event_map = {}
+        self.students = []
+        self._init_paged_list()
 
         ttk.Label(self, text="Mark Attendance", style="Header.TLabel").pack(pady=10)
 
@@ -891,7 +1148,7 @@ class AttendanceScreen(ttk.Frame):
         event_frame.pack(pady=10, padx=10, fill="x")
 
         ttk.Label(event_frame, text="Choose Event:").pack(side="left", padx=5)
-        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=("Arial", 12))
+        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=FONT_INPUT)
         self.event_menu.pack(side="left", padx=5)
         self.event_menu.bind("<<ComboboxSelected>>", self.handle_event_selection)
         
@@ -914,9 +1171,9 @@ class AttendanceScreen(ttk.Frame):
         self.tree.heading("Status", text="Attended (Y/N)")
         self.tree.pack(fill="both", expand=True, side="left")
 
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
         
         action_frame = ttk.Frame(self)
         action_frame.pack(pady=10)
@@ -930,35 +1187,26 @@ class AttendanceScreen(ttk.Frame):
         back_button = ttk.Button(self, text="Back to Dashboard", command=lambda: controller.show_dashboard(self.user))
         back_button.pack(pady=20)
 
+    def refresh(self, user):
+        self.user = user
+        self.populate_event_dropdown()
+        self.populate_attendance_list()
+
     def populate_event_dropdown(self):
-        all_events = events.get_all_events()
-        self.event_map = {f"{event[0]}: {event[1]}": event[0] for event in all_events}
-        self.event_menu['values'] = list(self.event_map.keys())
+        labels, self.event_map = events.get_dropdown_choices()
+        self.event_menu['values'] = labels
 
     def handle_event_selection(self, event_arg):
-        self.populate_attendance_list()
+        self.populate_attendance_list(reset_page=True)
 
-    def populate_attendance_list(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def populate_attendance_list(self, reset_page=False):
+        self.students = []
 
         selection = self.selected_event_id.get()
-        if not selection:
-            return
-            
-        event_id = self.event_map.get(selection)
+        event_id = self.event_map.get(selection) if selection else None
         if event_id:
             self.students = attendance.get_event_attendance(event_id)
-            for student in self.students:
-                self.tree.insert("", "end", values=student)
-
-    def filter_students(self, event):
-        filter_term = self.search_entry.get().lower()
-        self.tree.delete(*self.tree.get_children())
-
-        for student in self.students:
-            if filter_term in student[1].lower():
-                self.tree.insert("", "end", values=student)
+        self._set_rows(self.students, reset_page)
 
     def handle_mark_attendance(self, status):
         selected_item = self.tree.focus()
@@ -966,8 +1214,7 @@ class AttendanceScreen(ttk.Frame):
             messagebox.showerror("Selection Error", "Please select a student from the list.")
             return
 
-        student_details = self.tree.item(selected_item)
-        student_id = student_details['values'][0]
+        student_id = selected_item  # rows use the student ID as their iid
         
         selection = self.selected_event_id.get()
         event_id = self.event_map.get(selection)
@@ -993,6 +1240,8 @@ class ReportsScreen(ttk.Frame):
         self.selected_event_id = tk.StringVar()
         self.event_map = {}
         self.chart_window = None # To hold the chart window reference
+        self._stats_cache = {}  # event_id -> statistics, prefetched for all events
+        self._stats_generation = 0  # Bumped per prefetch; older results are dropped
 
         ttk.Label(self, text="Reports and Export", style="Header.TLabel").pack(pady=10)
 
@@ -1000,7 +1249,7 @@ class ReportsScreen(ttk.Frame):
         event_frame.pack(pady=10, padx=10, fill="x")
 
         ttk.Label(event_frame, text="Choose Event:").pack(side="left", padx=5)
-        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=("Arial", 12))
+        self.event_menu = ttk.Combobox(event_frame, textvariable=self.selected_event_id, width=40, font=FONT_INPUT)
         self.event_menu.pack(side="left", padx=5)
         self.event_menu.bind("<<ComboboxSelected>>", self.handle_event_selection)
         
@@ -1024,24 +1273,63 @@ class ReportsScreen(ttk.Frame):
         view_chart_button = ttk.Button(action_frame, text="View Attendance Chart", command=self.handle_view_chart)
         view_chart_button.pack(side="left", padx=10)
 
-        export_button = ttk.Button(action_frame, text="Export Attendance to CSV", command=self.handle_export_csv, style="Accent.TButton")
-        export_button.pack(side="left", padx=10)
+        self.export_button = ttk.Button(action_frame, text="Export Attendance to CSV", command=self.handle_export_csv, style="Accent.TButton")
+        self.export_button.pack(side="left", padx=10)
         
-        refresh_button = ttk.Button(action_frame, text="Refresh Stats", command=self.display_statistics)
+        refresh_button = ttk.Button(action_frame, text="Refresh Stats", command=self.refresh_statistics)
         refresh_button.pack(side="left", padx=10)
         
         back_button = ttk.Button(action_frame, text="Back to Dashboard", command=lambda: controller.show_dashboard(self.user))
         back_button.pack(side="left", padx=10)
 
+        # Shown (indeterminate) only while an export runs in the background
+        self.export_progress = ttk.Progressbar(self, mode="indeterminate", length=300)
+
+    def refresh(self, user):
+        # The labels are updated once the statistics prefetch arrives
+        self.user = user
+        self.populate_event_dropdown()
+
     def handle_event_selection(self, event_arg):
         self.display_statistics()
 
     def populate_event_dropdown(self):
-        all_events = events.get_all_events()
-        self.event_map = {f"{event[0]}: {event[1]}": event[0] for event in all_events}
-        self.event_menu['values'] = list(self.event_map.keys())
+        labels, self.event_map = events.get_dropdown_choices()
+        self.event_menu['values'] = labels
+        self._prefetch_statistics()
+
+    def _prefetch_statistics(self):
+        # Statistics for every event are loaded in the background, so choosing
+        # an event usually only has to update the labels
+        from . import reports
+        self._stats_cache = {}
+        self._stats_generation += 1
+        generation = self._stats_generation
+        fetch_in_background(self, reports.get_all_event_statistics,
+                            lambda stats_by_event: self._apply_statistics(generation, stats_by_event))
+
+    def _apply_statistics(self, generation, stats_by_event):
+        if generation != self._stats_generation:
+            return  # A newer prefetch has started since; its result wins
+        self._stats_cache = stats_by_event
+        # The user didn't ask for this update, so an invalid selection is not reported
+        self.display_statistics(show_errors=False)
+
+    def _get_statistics(self, event_id):
+        """Returns the event's statistics, from the prefetched ones when available."""
+        from . import reports
+        statistics = self._stats_cache.get(event_id)
+        if statistics is None:
+            statistics = reports.get_event_statistics(event_id)
+            if statistics:
+                self._stats_cache[event_id] = statistics
+        return statistics
+
+    def refresh_statistics(self):
+        # Reloads all events in the background; _apply_statistics updates the labels
+        self._prefetch_statistics()
 
-    def display_statistics(self):
+    def display_statistics(self, show_errors=True):
         selected_event = self.selected_event_id.get()
         if not selected_event:
             self.registered_label.config(text="Total Registered: -")
@@ -1051,7 +1339,7 @@ class ReportsScreen(ttk.Frame):
 
         event_id = self.event_map.get(selected_event)
         if event_id:
-            statistics = reports.get_event_statistics(event_id)
+            statistics = self._get_statistics(event_id)
             if statistics:
                 self.registered_label.config(text=f"Total Registered: {statistics['registered']}")
                 self.attended_label.config(text=f"Total Attended: {statistics['attended']}")
@@ -1060,12 +1348,11 @@ class ReportsScreen(ttk.Frame):
                 self.registered_label.config(text="Total Registered: N/A")
                 self.attended_label.config(text="Total Attended: N/A")
                 self.percentage_label.config(text="Attendance Percentage: N/A")
-        else:
+        elif show_errors:
             messagebox.showerror("Error", "Invalid event selected.")
 
     def handle_view_chart(self):
-        from PIL import Image, ImageTk
-
+        from . import reports
         selected_event = self.selected_event_id.get()
         if not selected_event:
             messagebox.showerror("Selection Error", "Please select an event to view its chart.")
@@ -1073,41 +1360,39 @@ class ReportsScreen(ttk.Frame):
 
         event_id = self.event_map.get(selected_event)
         if event_id:
-            # The chart path is relative to the static folder, e.g., 'static/chart.png'
-            # We need the full path to open it with PIL.
-            relative_chart_path = reports.generate_attendance_chart(event_id)
-            
-            if not relative_chart_path:
+            stats = self._get_statistics(event_id)
+            if not stats or stats['registered'] == 0:
                 messagebox.showinfo("No Data", "Not enough data to generate a chart for this event.")
                 return
 
-            full_chart_path = os.path.join("event_system", relative_chart_path)
-
             if self.chart_window and self.chart_window.winfo_exists():
                 self.chart_window.destroy()
 
             self.chart_window = tk.Toplevel(self.controller)
             self.chart_window.title("Attendance Chart")
 
-            try:
-                img = Image.open(full_chart_path)
-                photo = ImageTk.PhotoImage(img)
-                
-                chart_label = ttk.Label(self.chart_window, image=photo)
-                chart_label.image = photo # Keep a reference to avoid garbage collection
-                chart_label.pack(pady=10, padx=10)
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not display chart: {e}")
-                self.chart_window.destroy()
-            finally:
-                # Clean up the temporary file after displaying it
-                if os.path.exists(full_chart_path):
-                    os.remove(full_chart_path)
+            canvas = tk.Canvas(self.chart_window, width=reports.CHART_WIDTH, height=reports.CHART_HEIGHT, background="white")
+            canvas.pack(pady=10, padx=10)
+            self._draw_attendance_chart(canvas, stats)
         else:
             messagebox.showerror("Error", "Invalid event selected.")
 
+    def _draw_attendance_chart(self, canvas, stats):
+        """Draws the attendance bar chart on a Tk canvas, mirroring the web SVG."""
+        from . import reports
+        (left, top, right, bottom), bars = reports.attendance_chart_bars(stats)
+        canvas.create_text(reports.CHART_WIDTH / 2, top / 2, text=f"Attendance for: {stats['event_name']}", font=FONT_BODY)
+        canvas.create_text(18, (top + bottom) / 2, text="Number of Students", angle=90)
+        canvas.create_line(left, top, left, bottom)
+        canvas.create_line(left, bottom, right, bottom)
+        for label, value, x0, y0, x1, y1, color in bars:
+            center = (x0 + x1) / 2
+            canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
+            canvas.create_text(center, y0 - 4, text=str(int(value)), anchor="s")
+            canvas.create_text(center, bottom + 4, text=label, anchor="n")
+
     def handle_export_csv(self):
+        from . import reports
         selected_event = self.selected_event_id.get()
         if not selected_event:
             messagebox.showerror("Selection Error", "Please select an event to export its report.")
@@ -1121,12 +1406,22 @@ class ReportsScreen(ttk.Frame):
                 title="Save Attendance Report As"
             )
             if file_path:
-                result = reports.export_attendance_to_csv(event_id, file_path)
-                if result and "Success" in result:
-                    messagebox.showinfo("Export Successful", result)
-                elif result and "Info" in result:
-                    messagebox.showinfo("Export Information", result)
-                else:
-                    messagebox.showerror("Export Error", result if result else "Failed to export attendance data.")
+                # Large events take a while to export, so it runs off the Tk thread
+                self.export_button.state(["disabled"])
+                self.export_progress.pack(pady=(0, 10))
+                self.export_progress.start(10)
+                fetch_in_background(self, lambda: reports.export_attendance_to_csv(event_id, file_path),
+                                    self._apply_export_result)
+        else:
+            messagebox.showerror("Error", "Invalid event selected.")
+
+    def _apply_export_result(self, result):
+        self.export_progress.stop()
+        self.export_progress.pack_forget()
+        self.export_button.state(["!disabled"])
+        if result and "Success" in result:
+            messagebox.showinfo("Export Successful", result)
+        elif result and "Info" in result:
+            messagebox.showinfo("Export Information", result)
         else:
-            messagebox.showerror("Error", "Invalid event selected.")
\ No newline at end of file
+            messagebox.showerror("Export Error", result if result else "Failed to export attendance data.")
\ No newline at end of file
@@ -267,7 +267,7 @@ def reports_page():
         stats = reports.get_event_statistics(selected_event_id)
         if stats:
             # Generate the chart and get the path
-            chart_path = reports.generate_attendance_chart(selected_event_id)
+            chart_path = reports.generate_attendance_chart(selected_event_id, stats)
 
     return render_template('reports.html', 
                            events=all_events, 
@@ -331,14 +331,9 @@ def emails_page():
             email_utils.send_email(recipient, f"TEST: {subject}", body)
             flash(f"Test email sent to {recipient}", 'success')
         else:
-            registered_students_data = registrations.get_registered_students(event_id)
-            if not registered_students_data:
-                flash("No students are registered for this event.", 'warning')
-                return redirect(url_for('emails_page'))
-
-            recipients = [student[2] for student in registered_students_data if student[2]]
+            recipients = registrations.get_recipient_emails(event_id)
             if not recipients:
-                flash("No valid email addresses found for registered students.", 'warning')
+                flash("No students are registered for this event.", 'warning')
                 return redirect(url_for('emails_page'))
             
             email_utils.send_emails_in_background(recipients, subject, body)